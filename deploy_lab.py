@@ -2,6 +2,7 @@
 Automated deployment script for AWS Learner Lab.
 This script sets up the environment, creates DynamoDB tables, and seeds data.
 """
+import importlib
 import os
 import sys
 import subprocess
@@ -9,6 +10,8 @@ import platform
 from pathlib import Path
 import shutil
 
+sys.path.insert(0, str(Path(__file__).parent))
+
 def run_command(command, shell=False):
     """Run a shell command and check for errors."""
     print(f"Running: {' '.join(command) if isinstance(command, list) else command}")
@@ -19,6 +22,24 @@ def run_command(command, shell=False):
         print(f"Error running command: {e}")
         return False
 
+def run_step(module_name, *args):
+    """Import a step module and run its main() in-process, checking for errors."""
+    print(f"Running: {module_name}.main")
+    try:
+        # Imported only now, so import errors (e.g. a dependency pip failed
+        # to install) are reported as a failed step like any other
+        importlib.import_module(module_name).main(*args)
+        return True
+    except SystemExit as e:
+        # Step scripts report failure via sys.exit(1); don't let it end the deployment.
+        if e.code in (None, 0):
+            return True
+        print(f"Error running step: exit code {e.code}")
+        return False
+    except Exception as e:
+        print(f"Error running step: {e}")
+        return False
+
 def main():
     print("Starting Leave Management System Deployment (Learner Lab Mode)")
     
@@ -38,11 +59,12 @@ def main():
     if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]):
         print("Failed to install dependencies.")
         return
+    # Let the import system see the packages pip just installed
+    importlib.invalidate_caches()
 
     # 3. Initialize DynamoDB Tables
     print("\nInitializing DynamoDB Tables...")
-    # Use the module execution to ensure path is correct
-    if not run_command([sys.executable, "scripts/init_dynamodb_tables.py"]):
+    if not run_step("scripts.init_dynamodb_tables"):
         print("Failed to create tables.")
         return
 
@@ -50,7 +72,7 @@ def main():
     print("\nPreparing Seed Data...")
     data_file = "employee leave tracking data.xlsx"
     if os.path.exists(data_file):
-        if not run_command([sys.executable, "-m", "src.data_prep.prepare_seed_data", "--input", data_file]):
+        if not run_step("src.data_prep.prepare_seed_data", Path(data_file), Path("data")):
             print("Data prep failed (maybe missing pandas/openpyxl?). Skipping data prep.")
     else:
         print(f"{data_file} not found. Skipping data prep (assuming CSVs exist in data/).")
@@ -58,7 +80,7 @@ def main():
     # 5. Seed DynamoDB
     print("\nSeeding DynamoDB Tables...")
     if os.path.exists("data/seed_engineers.csv"):
-        if not run_command([sys.executable, "scripts/seed_dynamodb.py"]):
+        if not run_step("scripts.seed_dynamodb", Path("data/seed_engineers.csv")):
              print("Failed to seed tables.")
     else:
         print("data/seed_engineers.csv not found. Cannot seed tables.")
@@ -5,6 +5,17 @@ import os
 import sys
 from pathlib import Path
 
+try:
+    from dotenv import load_dotenv
+    load_dotenv(override=False)  # Load .env once for every check
+except ImportError:
+    pass  # python-dotenv is optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scripts.check_runner import run_checks
+
+
 def check_env_file():
     """Check if .env file exists."""
     env_path = Path(".env")
@@ -18,9 +29,6 @@ def check_env_file():
 
 def check_env_vars():
     """Check if required environment variables are set."""
-    from dotenv import load_dotenv
-    load_dotenv()
-    
     required_vars = {
         "GOOGLE_API_KEY": "Gemini API Key",
         "AWS_REGION": "AWS Region",
@@ -54,33 +62,25 @@ def check_env_vars():
     return all_set
 
 def check_aws_config():
-    """Check if AWS CLI is configured."""
+    """Check if AWS credentials are configured."""
     try:
-        import subprocess
-        result = subprocess.run(
-            ["aws", "configure", "list"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            print("\n✅ AWS CLI is configured")
+        import boto3
+        creds = boto3.Session().get_credentials()
+        if creds is not None and creds.access_key is not None:
+            print("\n✅ AWS credentials are configured")
             return True
         else:
-            print("\n❌ AWS CLI not configured properly")
+            print("\n❌ AWS credentials not configured properly")
             print("   Run: aws configure")
             return False
     except Exception as e:
-        print(f"\n⚠️  Could not check AWS CLI: {e}")
+        print(f"\n⚠️  Could not check AWS credentials: {e}")
         return False
 
 def check_dynamodb_tables():
     """Check if DynamoDB tables exist."""
     try:
         import boto3
-        from dotenv import load_dotenv
-        load_dotenv()
-        
         region = os.getenv("AWS_REGION", "us-east-1")
         dynamodb = boto3.client("dynamodb", region_name=region)
         
@@ -90,7 +90,9 @@ def check_dynamodb_tables():
             os.getenv("LEAVE_MGMT_REQUEST_TABLE", "LeaveRequests"),
         }
         
-        existing_tables = set(dynamodb.list_tables().get("TableNames", []))
+        existing_tables = set()
+        for page in dynamodb.get_paginator("list_tables").paginate():
+            existing_tables.update(page.get("TableNames", []))
         
         print("\n📊 DynamoDB Tables Status:")
         all_exist = True
@@ -113,7 +115,6 @@ def check_dynamodb_tables():
 def check_gemini():
     """Check if Gemini integration works."""
     try:
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
         from src.agent.gemini_client import GeminiLLM
         
         llm = GeminiLLM()
@@ -155,15 +156,19 @@ def main():
     print("🚀 Leave Management System - Initiation Check")
     print("=" * 60)
     
-    checks = {
-        "Environment File": check_env_file(),
-        "Environment Variables": check_env_vars(),
-        "AWS Configuration": check_aws_config(),
-        "DynamoDB Tables": check_dynamodb_tables(),
-        "Gemini Integration": check_gemini(),
-        "Data Files": check_data_files(),
+    check_fns = {
+        "Environment File": check_env_file,
+        "Environment Variables": check_env_vars,
+        "AWS Configuration": check_aws_config,
+        "DynamoDB Tables": check_dynamodb_tables,
+        "Gemini Integration": check_gemini,
+        "Data Files": check_data_files,
     }
     
+    # The checks are independent and mostly network-bound, so run them
+    # concurrently and replay their output in the original order.
+    checks = run_checks(check_fns)
+    
     print("\n" + "=" * 60)
     print("📊 Summary")
     print("=" * 60)
@@ -2,11 +2,13 @@
 Simple local API server to run the backend without deploying to AWS Lambda.
 Listens on port 3001 and mimics the Lambda Function URL behavior.
 """
+import base64
 import json
+import os
 import sys
 import traceback
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
 from typing import Any, Dict
 
 # Import the lambda handler
@@ -15,13 +17,22 @@ sys.path.append(".")
 from src.agent.lambda_handler import lambda_handler
 
 PORT = 3001
+TEXT_CONTENT_TYPES = ("application/json", "text/")
+
+# Include tracebacks in 500 responses only when explicitly debugging
+DEBUG = os.environ.get("LEAVE_MGMT_DEBUG", "").lower() in ("1", "true", "yes")
 
 class LocalLambdaHandler(BaseHTTPRequestHandler):
+    _CORS_HEADERS = (
+        ('Access-Control-Allow-Origin', '*'),
+        ('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS'),
+        ('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With'),
+    )
+
     def do_OPTIONS(self):
         self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With')
+        for k, v in self._CORS_HEADERS:
+            self.send_header(k, v)
         self.end_headers()
 
     def do_GET(self):
@@ -36,11 +47,19 @@ class LocalLambdaHandler(BaseHTTPRequestHandler):
             parsed_url = urlparse(self.path)
             path = parsed_url.path
             
-            # Read body if present
+            # Read body if present; text bodies are decoded once here, anything
+            # else is passed through base64-encoded like a Function URL does
             body = None
-            if "Content-Length" in self.headers:
-                content_length = int(self.headers["Content-Length"])
-                body = self.rfile.read(content_length).decode("utf-8")
+            is_base64 = False
+            content_length = int(self.headers.get("Content-Length") or 0)
+            if content_length:
+                raw = self.rfile.read(content_length)
+                content_type = self.headers.get("Content-Type", "")
+                if not content_type or content_type.startswith(TEXT_CONTENT_TYPES):
+                    body = raw.decode("utf-8")
+                else:
+                    body = base64.b64encode(raw).decode("ascii")
+                    is_base64 = True
             
             event = {
                 "requestContext": {
@@ -50,8 +69,10 @@ class LocalLambdaHandler(BaseHTTPRequestHandler):
                     }
                 },
                 "body": body,
+                "isBase64Encoded": is_base64,
                 "headers": dict(self.headers),
-                "queryStringParameters": parse_qs(parsed_url.query)
+                # Lambda passes single-valued parameters, not lists
+                "queryStringParameters": dict(parse_qsl(parsed_url.query))
             }
             
             # Call the actual Lambda handler
@@ -77,14 +98,20 @@ class LocalLambdaHandler(BaseHTTPRequestHandler):
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            error = {"error": str(e), "traceback": traceback.format_exc()}
+            error = {"error": str(e)}
+            if DEBUG:
+                error["traceback"] = traceback.format_exc()
             self.wfile.write(json.dumps(error).encode("utf-8"))
             print(f"Error processing request: {e}")
 
 def run_server():
     print(f"🚀 Starting local backend on http://localhost:{PORT}")
     print("   Press Ctrl+C to stop")
-    server = HTTPServer(('localhost', PORT), LocalLambdaHandler)
+    # Each request gets its own thread so parallel frontend fetches don't queue
+    # behind one another; importing lambda_handler has already built the
+    # shared clients.
+    server = ThreadingHTTPServer(('localhost', PORT), LocalLambdaHandler)
+    server.daemon_threads = True
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -0,0 +1,56 @@
+"""
+Run independent setup checks concurrently while keeping their output readable.
+
+Shared by initiate.py and scripts/test_setup.py.
+"""
+from __future__ import annotations
+
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class _CheckOutput:
+    """stdout proxy that buffers each worker thread's output while a check runs."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        buf = getattr(self._local, "buf", None)
+        return (buf or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def run(self, check: Callable[[], Any]):
+        """Run a check, returning its result and everything it printed."""
+        self._local.buf = io.StringIO()
+        try:
+            return check(), self._local.buf.getvalue()
+        finally:
+            self._local.buf = None
+
+
+def run_checks(checks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """Run the checks concurrently, replaying their output in the given order.
+
+    Returns each check's result, keyed by name in the same order.
+    """
+    output = _CheckOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {name: executor.submit(output.run, check) for name, check in checks.items()}
+            outcomes = {name: future.result() for name, future in futures.items()}
+    finally:
+        sys.stdout = output._stream
+
+    results = {}
+    for name, (result, printed) in outcomes.items():
+        sys.stdout.write(printed)
+        results[name] = result
+    return results
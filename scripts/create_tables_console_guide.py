@@ -17,16 +17,13 @@ def get_console_url(region):
     """Get DynamoDB console URL for the region."""
     return f"https://{region}.console.aws.amazon.com/dynamodbv2/home?region={region}#tables"
 
-def check_table_exists(table_name, region):
-    """Check if a DynamoDB table exists."""
-    try:
-        dynamodb = boto3.client('dynamodb', region_name=region)
-        response = dynamodb.describe_table(TableName=table_name)
-        return True, response['Table']
-    except dynamodb.exceptions.ResourceNotFoundException:
-        return False, None
-    except Exception as e:
-        return False, str(e)
+def list_existing_tables(dynamodb_client):
+    """Return the names of all DynamoDB tables in the region."""
+    existing = set()
+    paginator = dynamodb_client.get_paginator('list_tables')
+    for page in paginator.paginate():
+        existing.update(page['TableNames'])
+    return existing
 
 def print_table_config(name, pk, pk_type, gsi=None):
     """Print table configuration."""
@@ -45,6 +42,7 @@ def main():
     """Main function to guide table creation."""
     region = get_region()
     console_url = get_console_url(region)
+    dynamodb_client = boto3.client('dynamodb', region_name=region)
     
     print("="*70)
     print("🚀 DynamoDB Table Creation Guide (AWS Console)")
@@ -80,10 +78,10 @@ def main():
     
     existing_tables = []
     missing_tables = []
+    existing = list_existing_tables(dynamodb_client)
     
-    for table_name, config in tables.items():
-        exists, info = check_table_exists(table_name, region)
-        if exists:
+    for table_name in tables:
+        if table_name in existing:
             print(f"✅ {table_name}: ALREADY EXISTS")
             existing_tables.append(table_name)
         else:
@@ -146,9 +144,9 @@ def main():
     # Recheck tables
     print("\n🔍 Verifying tables...\n")
     all_exist = True
+    existing = list_existing_tables(dynamodb_client)
     for table_name in missing_tables:
-        exists, info = check_table_exists(table_name, region)
-        if exists:
+        if table_name in existing:
             print(f"✅ {table_name}: CREATED SUCCESSFULLY")
         else:
             print(f"❌ {table_name}: STILL NOT FOUND")
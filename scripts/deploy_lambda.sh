@@ -15,6 +15,7 @@ FUNCTION_NAME=${1:-leave-mgmt-agent}
 REGION=${2:-us-east-1}
 PACKAGE_DIR="lambda-package"
 ZIP_FILE="lambda-agent.zip"
+RUNTIME_PYTHON="python3.11"  # Lambda runtime, also used to pre-compile bytecode
 
 echo -e "${BLUE}=========================================${NC}"
 echo -e "${BLUE}Lambda Deployment Script${NC}"
@@ -59,10 +60,24 @@ echo "Copying agent code..."
 cp -r src/agent $PACKAGE_DIR/
 cp -r src/storage $PACKAGE_DIR/
 cp src/config.py $PACKAGE_DIR/
+# Local bytecode caches are built for the developer's interpreter; drop them
+find $PACKAGE_DIR -name __pycache__ -type d -prune -exec rm -rf {} +
 
-# Install dependencies
+# Install only what the handler imports at runtime
 echo "Installing dependencies..."
-pip install -r requirements.txt -t $PACKAGE_DIR/ --quiet
+pip install -r requirements-lambda.txt -t $PACKAGE_DIR/ --quiet
+
+# Pre-compile bytecode so cold starts load .pyc files instead of compiling.
+# The cache is only used by the same Python version, so compile with the
+# runtime's interpreter; unchecked-hash skips source mtime checks on import.
+if command -v $RUNTIME_PYTHON > /dev/null 2>&1; then
+    echo "Compiling bytecode..."
+    # A file that fails to compile is simply compiled on import instead
+    $RUNTIME_PYTHON -m compileall -q --invalidation-mode unchecked-hash $PACKAGE_DIR || \
+        echo -e "${YELLOW}⚠️  Some files could not be pre-compiled${NC}"
+else
+    echo -e "${YELLOW}⚠️  $RUNTIME_PYTHON not found; skipping bytecode pre-compilation${NC}"
+fi
 
 # Create zip file
 echo "Creating zip file..."
@@ -119,7 +134,7 @@ else
         echo "Please specify a role ARN manually:"
         echo "aws lambda create-function \\"
         echo "  --function-name $FUNCTION_NAME \\"
-        echo "  --runtime python3.11 \\"
+        echo "  --runtime $RUNTIME_PYTHON \\"
         echo "  --role arn:aws:iam::$ACCOUNT_ID:role/LabRole \\"
         echo "  --handler agent.lambda_handler.lambda_handler \\"
         echo "  --zip-file fileb://$ZIP_FILE \\"
@@ -153,7 +168,7 @@ else
     echo "Creating Lambda function from S3..."
     aws lambda create-function \
         --function-name $FUNCTION_NAME \
-        --runtime python3.11 \
+        --runtime $RUNTIME_PYTHON \
         --role $LAMBDA_ROLE \
         --handler agent.lambda_handler.lambda_handler \
         --code S3Bucket=${LEAVE_MGMT_S3_BUCKET},S3Key=lambda/$ZIP_FILE \
@@ -2,9 +2,9 @@
 Initialize DynamoDB tables required for the leave management system.
 
 This script creates:
-- EngineerAvailability table (employee_id as PK)
+- EngineerAvailability table (employee_id as PK, entity_type GSI)
 - LeaveQuota table (employee_id as PK)
-- LeaveRequests table (request_id as PK, employee_id GSI)
+- LeaveRequests table (request_id as PK, employee_id and status/start_date GSIs)
 
 Run this script once before starting the Kafka consumer.
 """
@@ -13,103 +13,137 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from pathlib import Path
+from typing import Any, Dict
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from src.config import load as load_config
-
-
-def create_engineer_table(dynamodb, table_name: str, region: str) -> None:
-    """Create the EngineerAvailability table."""
-    try:
-        table = dynamodb.create_table(
-            TableName=table_name,
-            KeySchema=[
-                {"AttributeName": "employee_id", "KeyType": "HASH"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "employee_id", "AttributeType": "S"},
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        print(f"Created table: {table_name}")  # noqa: T201
-        table.wait_until_exists()
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"Table {table_name} already exists")  # noqa: T201
-        else:
-            raise
-
-
-def create_quota_table(dynamodb, table_name: str, region: str) -> None:
-    """Create the LeaveQuota table."""
-    try:
-        table = dynamodb.create_table(
-            TableName=table_name,
-            KeySchema=[
-                {"AttributeName": "employee_id", "KeyType": "HASH"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "employee_id", "AttributeType": "S"},
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        print(f"Created table: {table_name}")  # noqa: T201
-        table.wait_until_exists()
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"Table {table_name} already exists")  # noqa: T201
-        else:
-            raise
-
-
-def create_request_table(dynamodb, table_name: str, region: str) -> None:
-    """Create the LeaveRequests table with GSI on employee_id."""
+from src.storage.dynamodb_storage import APPROVED_BY_START_INDEX, EMPLOYEE_INDEX
+
+
+def engineer_table_spec(table_name: str) -> Dict[str, Any]:
+    """Return the create_table arguments for the EngineerAvailability table with GSI on entity_type."""
+    return {
+        "TableName": table_name,
+        "KeySchema": [
+            {"AttributeName": "employee_id", "KeyType": "HASH"},
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": "employee_id", "AttributeType": "S"},
+            {"AttributeName": "entity_type", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": EMPLOYEE_INDEX,
+                "KeySchema": [
+                    {"AttributeName": "entity_type", "KeyType": "HASH"},
+                    {"AttributeName": "employee_id", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["name", "current_status"],
+                },
+            }
+        ],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+
+
+def quota_table_spec(table_name: str) -> Dict[str, Any]:
+    """Return the create_table arguments for the LeaveQuota table."""
+    return {
+        "TableName": table_name,
+        "KeySchema": [
+            {"AttributeName": "employee_id", "KeyType": "HASH"},
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": "employee_id", "AttributeType": "S"},
+        ],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+
+
+def request_table_spec(table_name: str) -> Dict[str, Any]:
+    """Return the create_table arguments for the LeaveRequests table with GSIs on employee_id and status/start_date."""
+    return {
+        "TableName": table_name,
+        "KeySchema": [
+            {"AttributeName": "request_id", "KeyType": "HASH"},
+        ],
+        "AttributeDefinitions": [
+            {"AttributeName": "request_id", "AttributeType": "S"},
+            {"AttributeName": "employee_id", "AttributeType": "S"},
+            {"AttributeName": "status", "AttributeType": "S"},
+            {"AttributeName": "start_date", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "employee_id-index",
+                "KeySchema": [
+                    {"AttributeName": "employee_id", "KeyType": "HASH"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": APPROVED_BY_START_INDEX,
+                "KeySchema": [
+                    {"AttributeName": "status", "KeyType": "HASH"},
+                    {"AttributeName": "start_date", "KeyType": "RANGE"},
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["employee_id", "end_date", "leave_type"],
+                },
+            },
+        ],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+
+
+def _create(dynamodb, table_spec: Dict[str, Any]):
+    """Create a table from its spec, returning the Table or None if it already exists."""
+    table_name = table_spec["TableName"]
     try:
-        table = dynamodb.create_table(
-            TableName=table_name,
-            KeySchema=[
-                {"AttributeName": "request_id", "KeyType": "HASH"},
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "request_id", "AttributeType": "S"},
-                {"AttributeName": "employee_id", "AttributeType": "S"},
-            ],
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": "employee_id-index",
-                    "KeySchema": [
-                        {"AttributeName": "employee_id", "KeyType": "HASH"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                }
-            ],
-            BillingMode="PAY_PER_REQUEST",
-        )
+        table = dynamodb.create_table(**table_spec)
         print(f"Created table: {table_name}")  # noqa: T201
-        table.wait_until_exists()
+        return table
     except ClientError as e:
         if e.response["Error"]["Code"] == "ResourceInUseException":
             print(f"Table {table_name} already exists")  # noqa: T201
-        else:
-            raise
+            return None
+        raise
 
 
 def main() -> None:
     cfg = load_config()
-    dynamodb = boto3.resource("dynamodb", region_name=cfg.region)
+    dynamodb = boto3.resource(
+        "dynamodb",
+        region_name=cfg.region,
+        config=Config(retries={"mode": "adaptive"}),
+    )
+
+    specs = [
+        engineer_table_spec(cfg.dynamodb_engineer_table),
+        quota_table_spec(cfg.dynamodb_quota_table),
+        request_table_spec(cfg.dynamodb_request_table),
+    ]
 
     print("Creating DynamoDB tables...")  # noqa: T201
-    create_engineer_table(dynamodb, cfg.dynamodb_engineer_table, cfg.region)
-    create_quota_table(dynamodb, cfg.dynamodb_quota_table, cfg.region)
-    create_request_table(dynamodb, cfg.dynamodb_request_table, cfg.region)
+    # Tables are independent, so issue the creates and the waits concurrently;
+    # total time is bounded by the slowest table instead of the sum of all three.
+    with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+        tables = list(executor.map(lambda spec: _create(dynamodb, spec), specs))
+        created = [table for table in tables if table is not None]
+        list(executor.map(lambda table: table.wait_until_exists(), created))
     print("All tables created successfully!")  # noqa: T201
 
 
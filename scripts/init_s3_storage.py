@@ -1,6 +1,10 @@
 """
 Initialize S3 storage for the leave management system.
-Creates the S3 bucket and folder structure.
+Creates the S3 bucket.
+
+S3 has no real folders: prefixes such as "EngineerAvailability/" are virtual
+and come into existence when the first object is written under them, so no
+placeholder objects are created here.
 """
 from __future__ import annotations
 
@@ -50,30 +54,6 @@ def create_bucket(bucket_name: str, region: str) -> bool:
             return False
 
 
-def create_folder_structure(bucket_name: str, region: str) -> None:
-    """Create folder structure in S3."""
-    s3_client = boto3.client('s3', region_name=region)
-    
-    folders = [
-        "EngineerAvailability/",
-        "LeaveQuota/",
-        "LeaveRequests/",
-        "analytics/",
-        "raw-data/"
-    ]
-    
-    for folder in folders:
-        try:
-            s3_client.put_object(
-                Bucket=bucket_name,
-                Key=folder,
-                Body=b''
-            )
-            print(f"✅ Created folder: {folder}")
-        except ClientError as e:
-            print(f"⚠️  Error creating folder {folder}: {e}")
-
-
 def main() -> None:
     """Main function."""
     region = os.getenv("AWS_REGION", "us-east-1")
@@ -96,10 +76,6 @@ def main() -> None:
         print("\n❌ Failed to create/verify bucket")
         sys.exit(1)
     
-    # Create folder structure
-    print("\n📁 Creating folder structure...")
-    create_folder_structure(bucket_name, region)
-    
     print("\n" + "=" * 60)
     print("✅ S3 storage initialized successfully!")
     print("=" * 60)
@@ -5,67 +5,268 @@ This script can be run periodically to sync DynamoDB data to S3 for analytics.
 """
 from __future__ import annotations
 
+import gzip
+import io
 import json
+import math
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import boto3
 import pandas as pd
+from boto3.dynamodb.types import TypeDeserializer
 
-from src.config import load as load_config
+from src.config import get_client, load as load_config
+from src.storage.dynamodb_storage import AVAILABILITY_STATS_KEY
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """JSON encoder for Decimal types."""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+def _decimal_to_float(obj: Any) -> Any:
+    """json.dumps default hook: DynamoDB numbers come back as Decimal."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
 
 
-def export_table_to_s3(dynamodb, table_name: str, s3_bucket: str, s3_prefix: str) -> None:
-    """Export DynamoDB table to S3 as JSON."""
-    table = dynamodb.Table(table_name)
-    s3_client = boto3.client("s3")
-    
-    print(f"Exporting {table_name} to S3...")  # noqa: T201
-    
-    # Scan table
-    items = []
-    response = table.scan()
-    items.extend(response.get("Items", []))
-    
-    while "LastEvaluatedKey" in response:
-        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-        items.extend(response.get("Items", []))
-    
-    # Convert to JSON
-    json_data = json.dumps(items, cls=DecimalEncoder, default=str)
-    
-    # Upload to S3
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    s3_key = f"{s3_prefix}/{table_name}/{timestamp}.json"
-    
-    s3_client.put_object(
+_DESERIALIZER = TypeDeserializer()
+
+# S3 multipart uploads require every part except the last to be >= 5 MiB.
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Parallel-scan segments (and exported objects) per table: one per
+# SEGMENT_TARGET_BYTES of table data, capped at MAX_SEGMENTS
+SEGMENT_TARGET_BYTES = 256 * 1024 * 1024
+MAX_SEGMENTS = 16
+
+# Seconds between Athena query status checks
+ATHENA_POLL_INTERVAL = 1.0
+
+
+def _projection_kwargs(projection: str | None) -> Dict[str, Any]:
+    """Build scan arguments that fetch only the given comma-separated attributes."""
+    if not projection:
+        return {}
+    names = [name.strip() for name in projection.split(",")]
+    # Placeholders keep reserved words such as "status" usable in the expression
+    placeholders = {f"#a{i}": name for i, name in enumerate(names)}
+    return {
+        "ProjectionExpression": ", ".join(placeholders),
+        "ExpressionAttributeNames": placeholders,
+    }
+
+
+def _scan_segment_pages(
+    dynamodb_client,
+    table_name: str,
+    segment: int,
+    total_segments: int,
+    projection: str | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the item pages of a single parallel-scan segment of a DynamoDB table."""
+    paginator = dynamodb_client.get_paginator("scan")
+    pages = paginator.paginate(
+        TableName=table_name,
+        Segment=segment,
+        TotalSegments=total_segments,
+        PaginationConfig={"PageSize": 1000},
+        **_projection_kwargs(projection),
+    )
+    # The low-level client returns typed attribute values ({"S": ...});
+    # deserialize them to the same Python values the Table resource returns.
+    for page in pages:
+        yield [
+            {key: _DESERIALIZER.deserialize(value) for key, value in item.items()}
+            for item in page.get("Items", [])
+            # The availability counter is bookkeeping, not an employee row
+            if item.get("employee_id") != {"S": AVAILABILITY_STATS_KEY}
+        ]
+
+
+def _upload_ndjson(s3_client, s3_bucket: str, s3_key: str, pages: Iterable[List[Dict[str, Any]]]) -> int:
+    """Stream pages of items to S3 as gzipped NDJSON through a multipart upload."""
+    upload = s3_client.create_multipart_upload(
         Bucket=s3_bucket,
         Key=s3_key,
-        Body=json_data.encode("utf-8"),
-        ContentType="application/json",
+        ContentEncoding="gzip",
+        ContentType="application/x-ndjson",
     )
-    
-    print(f"✓ Exported {len(items)} items to s3://{s3_bucket}/{s3_key}")  # noqa: T201
+    upload_id = upload["UploadId"]
+    parts = []
+    buf = io.BytesIO()
+    # The export is bandwidth-bound, so favour speed over compression ratio.
+    gz = gzip.GzipFile(mode="wb", fileobj=buf, compresslevel=1)
+    count = 0
+
+    def flush() -> None:
+        part_number = len(parts) + 1
+        response = s3_client.upload_part(
+            Bucket=s3_bucket,
+            Key=s3_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=buf.getvalue(),
+        )
+        parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        buf.seek(0)
+        buf.truncate()
+
+    try:
+        for page in pages:
+            for item in page:
+                gz.write(json.dumps(item, default=_decimal_to_float).encode("utf-8"))
+                gz.write(b"\n")
+                count += 1
+            if buf.tell() >= MULTIPART_CHUNK_SIZE:
+                gz.flush()
+                flush()
+        # Closing writes the gzip trailer; the final part may be smaller than
+        # the multipart minimum, but at least one part is always required.
+        gz.close()
+        flush()
+        s3_client.complete_multipart_upload(
+            Bucket=s3_bucket,
+            Key=s3_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        s3_client.abort_multipart_upload(Bucket=s3_bucket, Key=s3_key, UploadId=upload_id)
+        raise
+    return count
+
+
+def _segment_count(dynamodb_client, table_name: str) -> int:
+    """Pick a parallel-scan segment count from the table's size.
+
+    DescribeTable's size is refreshed about every six hours, which is close
+    enough for sizing; small tables get a single segment and a single object.
+    """
+    size = dynamodb_client.describe_table(TableName=table_name)["Table"].get("TableSizeBytes", 0)
+    return max(1, min(MAX_SEGMENTS, math.ceil(size / SEGMENT_TARGET_BYTES)))
+
+
+def export_table_to_s3(
+    dynamodb_client,
+    table_name: str,
+    s3_bucket: str,
+    s3_prefix: str,
+    s3_client,
+    total_segments: int | None = None,
+    *,
+    projection: str | None = None,
+) -> None:
+    """
+    Export DynamoDB table to S3 as gzipped NDJSON, one object per parallel-scan segment.
+
+    ``total_segments`` defaults to one per SEGMENT_TARGET_BYTES of table data.
+    If ``projection`` (comma-separated attribute names) is given, only those
+    attributes are read from DynamoDB and exported.
+    """
+    if total_segments is None:
+        total_segments = _segment_count(dynamodb_client, table_name)
+
+    print(f"Exporting {table_name} to S3...")  # noqa: T201
+
+    now = datetime.utcnow()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    # Hive-style date partitions let Athena prune exports by date
+    partition = f"{s3_prefix}/{table_name}/year={now:%Y}/month={now:%m}/day={now:%d}"
+
+    def export_segment(segment: int) -> int:
+        # Pages are serialized and uploaded as they arrive, so each worker
+        # only ever holds about one scan page plus one upload part in memory.
+        s3_key = f"{partition}/{timestamp}_segment={segment}.json.gz"
+        pages = _scan_segment_pages(dynamodb_client, table_name, segment, total_segments, projection)
+        return _upload_ndjson(s3_client, s3_bucket, s3_key, pages)
+
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        total_items = sum(executor.map(export_segment, range(total_segments)))
+
+    print(  # noqa: T201
+        f"✓ Exported {total_items} items in {total_segments} segments "
+        f"to s3://{s3_bucket}/{partition}/"
+    )
+
+
+# Exported attributes Athena should read as numbers; everything else is a string
+NUMERIC_ATTRIBUTES = {"annual_allowance", "carried_over", "taken_ytd", "available_days", "days"}
+
+
+def _run_athena_query(athena_client, **kwargs) -> None:
+    """Start an Athena query and wait for it, raising if it fails or is cancelled."""
+    execution_id = athena_client.start_query_execution(**kwargs)["QueryExecutionId"]
+    while True:
+        status = athena_client.get_query_execution(QueryExecutionId=execution_id)["QueryExecution"]["Status"]
+        if status["State"] == "SUCCEEDED":
+            return
+        if status["State"] in ("FAILED", "CANCELLED"):
+            raise RuntimeError(
+                f"Athena query {execution_id} {status['State'].lower()}: "
+                f"{status.get('StateChangeReason', 'no reason given')}"
+            )
+        time.sleep(ATHENA_POLL_INTERVAL)
+
+
+def create_athena_table(
+    athena_client,
+    database: str,
+    table_name: str,
+    location: str,
+    columns: List[str],
+    output_location: str,
+) -> None:
+    """
+    Register an Athena table over a table's date-partitioned NDJSON exports.
+
+    Partition projection lets Athena derive the year/month/day partitions from
+    the S3 layout, so queries prune by date without a Glue crawler run.
+    """
+    column_ddl = ",\n  ".join(
+        f"`{name}` {'double' if name in NUMERIC_ATTRIBUTES else 'string'}" for name in columns
+    )
+    location = location.rstrip("/")
+    query = f"""
+CREATE EXTERNAL TABLE IF NOT EXISTS {database}.{table_name.lower()} (
+  {column_ddl}
+)
+PARTITIONED BY (year string, month string, day string)
+ROW FORMAT SERDE 'org.openx.data.jsonserde.JsonSerDe'
+LOCATION '{location}/'
+TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.year.type'='integer',
+  'projection.year.range'='2020,2100',
+  'projection.month.type'='integer',
+  'projection.month.range'='1,12',
+  'projection.month.digits'='2',
+  'projection.day.type'='integer',
+  'projection.day.range'='1,31',
+  'projection.day.digits'='2',
+  'storage.location.template'='{location}/year=${{year}}/month=${{month}}/day=${{day}}'
+)
+"""
+    _run_athena_query(
+        athena_client,
+        QueryString=query,
+        QueryExecutionContext={"Database": database},
+        ResultConfiguration={"OutputLocation": output_location},
+    )
+    print(f"✓ Registered Athena table: {database}.{table_name.lower()}")  # noqa: T201
 
 
 def create_athena_view(athena_client, database: str, view_name: str, query: str) -> None:
     """Create an Athena view for analytics."""
     try:
-        athena_client.start_query_execution(
+        _run_athena_query(
+            athena_client,
             QueryString=f"CREATE OR REPLACE VIEW {database}.{view_name} AS {query}",
             QueryExecutionContext={"Database": database},
             ResultConfiguration={
@@ -81,38 +282,70 @@ def create_athena_view(athena_client, database: str, view_name: str, query: str)
 def main() -> None:
     """Main export function."""
     cfg = load_config()
-    dynamodb = boto3.resource("dynamodb", region_name=cfg.region)
+    # Clients (and their connection pools) are shared by every table's segment workers
+    dynamodb_client = get_client("dynamodb", cfg.region)
+    s3_client = get_client("s3", cfg.region)
     s3_bucket = cfg.s3_bucket
     s3_prefix = "analytics/exports"
     
+    # Only the attributes the analytics dashboards use are exported
+    projections = {
+        cfg.dynamodb_engineer_table: "employee_id,current_status,on_leave_from,on_leave_to,updated_at",
+        cfg.dynamodb_quota_table: "employee_id,annual_allowance,carried_over,taken_ytd,available_days,updated_at",
+        cfg.dynamodb_request_table: "request_id,employee_id,leave_type,start_date,end_date,days,status",
+    }
+    
     print("Exporting DynamoDB tables to S3 for analytics...")  # noqa: T201
     print("=" * 60)  # noqa: T201
     
     # Export each table
     export_table_to_s3(
-        dynamodb,
+        dynamodb_client,
         cfg.dynamodb_engineer_table,
         s3_bucket,
-        s3_prefix
+        s3_prefix,
+        s3_client,
+        projection=projections[cfg.dynamodb_engineer_table],
     )
     
     export_table_to_s3(
-        dynamodb,
+        dynamodb_client,
         cfg.dynamodb_quota_table,
         s3_bucket,
-        s3_prefix
+        s3_prefix,
+        s3_client,
+        projection=projections[cfg.dynamodb_quota_table],
     )
     
     export_table_to_s3(
-        dynamodb,
+        dynamodb_client,
         cfg.dynamodb_request_table,
         s3_bucket,
-        s3_prefix
+        s3_prefix,
+        s3_client,
+        projection=projections[cfg.dynamodb_request_table],
     )
     
+    # Register the exports with Athena when a database is configured
+    athena_database = os.getenv("LEAVE_MGMT_ATHENA_DATABASE")
+    if athena_database:
+        athena_client = get_client("athena", cfg.region)
+        for table_name, projection in projections.items():
+            create_athena_table(
+                athena_client,
+                athena_database,
+                table_name,
+                f"s3://{s3_bucket}/{s3_prefix}/{table_name}",
+                [name.strip() for name in projection.split(",")],
+                f"s3://{s3_bucket}/athena-results/",
+            )
+    
     print("\n✓ Export complete!")  # noqa: T201
     print("Next steps:")  # noqa: T201
-    print("1. Run Glue Crawler to update table schemas")  # noqa: T201
+    if not athena_database:
+        print("1. Register the exports in Athena (set LEAVE_MGMT_ATHENA_DATABASE and re-run)")  # noqa: T201
+    else:
+        print("1. Athena tables are registered; partitions are projected from the S3 layout")  # noqa: T201
     print("2. Create QuickSight data source pointing to Athena")  # noqa: T201
     print("3. Build visualizations in QuickSight")  # noqa: T201
 
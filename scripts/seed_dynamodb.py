@@ -13,54 +13,94 @@ import argparse
 import os
 import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from pathlib import Path
+from typing import Any, Dict, List
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import boto3
 import pandas as pd
 
-from src.config import load as load_config
-
-
-def seed_engineer_availability(dynamodb, table_name: str, df: pd.DataFrame) -> None:
-    """Populate EngineerAvailability table."""
-    table = dynamodb.Table(table_name)
-    count = 0
-    for _, row in df.iterrows():
-        table.put_item(
-            Item={
-                "employee_id": str(row["employee_id"]),
-                "current_status": "AVAILABLE",
-                "on_leave_from": None,
-                "on_leave_to": None,
-                "updated_at": row.get("updated_at", ""),
-            }
-        )
-        count += 1
-    print(f"Seeded {count} employees into {table_name}")  # noqa: T201
-
-
-def seed_leave_quota(dynamodb, table_name: str, df: pd.DataFrame) -> None:
-    """Populate LeaveQuota table."""
-    table = dynamodb.Table(table_name)
-    count = 0
-    for _, row in df.iterrows():
-        table.put_item(
-            Item={
-                "employee_id": str(row["employee_id"]),
-                "annual_allowance": Decimal(str(row["annual_allowance"])),
-                "carried_over": Decimal(str(row.get("carried_over", 0))),
-                "taken_ytd": Decimal(str(row.get("taken_to_date", 0))),
-                "available_days": Decimal(str(row.get("remaining_leaves", 0))),
-                "updated_at": row.get("updated_at", ""),
-            }
-        )
-        count += 1
-    print(f"Seeded {count} quotas into {table_name}")  # noqa: T201
+from src.config import get_resource, load as load_config
+from src.storage.dynamodb_storage import AVAILABILITY_STATS_KEY, EMPLOYEE_ENTITY_TYPE
+
+
+# Columns read from seed_engineers.csv. Everything is read as text: the numeric
+# columns feed Decimal directly, so they never round-trip through float.
+ENGINEER_COLUMNS = {
+    "employee_id": "string",
+    "annual_allowance": "string",
+    "carried_over": "string",
+    "taken_to_date": "string",
+    "remaining_leaves": "string",
+    "updated_at": "string",
+}
+
+# Number of concurrent batch writers used when seeding a table
+WRITER_THREADS = 16
+
+# Rows parsed per chunk; each chunk is written while the next one is parsed
+CSV_CHUNK_SIZE = 10_000
+
+
+def write_items(region: str, table_name: str, items: List[Dict[str, Any]], workers: int = WRITER_THREADS) -> int:
+    """Write items to a table using several batch writers in parallel."""
+    if not items:
+        return 0
+    shard_size = -(-len(items) // workers)  # ceiling division
+    shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+    def write_shard(shard: List[Dict[str, Any]]) -> int:
+        # batch_writer buffers puts into 25-item BatchWriteItem calls and
+        # retries unprocessed items; each thread owns its own writer, built
+        # on its own resource since boto3 resources are not thread-safe.
+        table = get_resource("dynamodb", region).Table(table_name)
+        with table.batch_writer() as batch:
+            for item in shard:
+                batch.put_item(Item=item)
+        return len(shard)
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        return sum(executor.map(write_shard, shards))
+
+
+def seed_engineer_availability(region: str, table_name: str, df: pd.DataFrame) -> int:
+    """Populate EngineerAvailability table, returning the number of items written."""
+    # Display names ("adam-solomon" -> "Adam Solomon") are stored so the
+    # /employees endpoint doesn't derive them on every request
+    names = df["employee_id"].str.replace("-", " ").str.title()
+    items = [
+        {
+            "employee_id": str(row["employee_id"]),
+            "name": name,
+            "entity_type": EMPLOYEE_ENTITY_TYPE,
+            "current_status": "AVAILABLE",
+            "on_leave_from": None,
+            "on_leave_to": None,
+            "updated_at": row.get("updated_at", ""),
+        }
+        for row, name in zip(df.to_dict(orient="records"), names)
+    ]
+    return write_items(region, table_name, items)
+
+
+def seed_leave_quota(region: str, table_name: str, df: pd.DataFrame) -> int:
+    """Populate LeaveQuota table, returning the number of items written."""
+    items = [
+        {
+            "employee_id": str(row["employee_id"]),
+            "annual_allowance": Decimal(row["annual_allowance"]),
+            "carried_over": Decimal(row.get("carried_over", 0)),
+            "taken_ytd": Decimal(row.get("taken_to_date", 0)),
+            "available_days": Decimal(row.get("remaining_leaves", 0)),
+            "updated_at": row.get("updated_at", ""),
+        }
+        for row in df.to_dict(orient="records")
+    ]
+    return write_items(region, table_name, items)
 
 
 def main(csv_path: pathlib.Path) -> None:
@@ -69,14 +109,41 @@ def main(csv_path: pathlib.Path) -> None:
         sys.exit(1)
 
     cfg = load_config()
-    dynamodb = boto3.resource("dynamodb", region_name=cfg.region)
 
-    print(f"Reading employee data from {csv_path}...")  # noqa: T201
-    df = pd.read_csv(csv_path)
+    print(f"Seeding DynamoDB tables from {csv_path}...")  # noqa: T201
+    chunks = pd.read_csv(
+        csv_path,
+        usecols=lambda column: column in ENGINEER_COLUMNS,
+        dtype=ENGINEER_COLUMNS,
+        keep_default_na=False,
+        chunksize=CSV_CHUNK_SIZE,
+    )
+
+    def seed_chunk(df: pd.DataFrame):
+        return (
+            seed_engineer_availability(cfg.region, cfg.dynamodb_engineer_table, df),
+            seed_leave_quota(cfg.region, cfg.dynamodb_quota_table, df),
+        )
+
+    # Write each chunk on a background thread while the next one is parsed;
+    # at most one chunk is in flight, so memory stays bounded by the chunk size.
+    futures = []
+    with ThreadPoolExecutor(max_workers=1) as pipeline:
+        for chunk in chunks:
+            if futures:
+                futures[-1].result()
+            futures.append(pipeline.submit(seed_chunk, chunk))
+    engineers = sum(future.result()[0] for future in futures)
+    quotas = sum(future.result()[1] for future in futures)
+
+    # Every seeded engineer starts out available; leave approvals and
+    # cancellations keep the counter in step from here on
+    get_resource("dynamodb", cfg.region).Table(cfg.dynamodb_engineer_table).put_item(
+        Item={"employee_id": AVAILABILITY_STATS_KEY, "total_engineers": engineers, "on_leave": 0}
+    )
 
-    print("Seeding DynamoDB tables...")  # noqa: T201
-    seed_engineer_availability(dynamodb, cfg.dynamodb_engineer_table, df)
-    seed_leave_quota(dynamodb, cfg.dynamodb_quota_table, df)
+    print(f"Seeded {engineers} employees into {cfg.dynamodb_engineer_table}")  # noqa: T201
+    print(f"Seeded {quotas} quotas into {cfg.dynamodb_quota_table}")  # noqa: T201
     print("Seeding complete!")  # noqa: T201
 
 
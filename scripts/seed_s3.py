@@ -19,28 +19,80 @@ from src.storage.s3_storage import create_storage
 
 load_dotenv()
 
+# Columns (and their dtypes) each seeder reads from the CSV files. Missing
+# optional columns are tolerated; the seeders fall back to defaults.
+ENGINEER_COLUMNS = {
+    "employee_id": "string",
+    "department": "string",
+    "position": "string",
+    "status": "string",
+    "updated_at": "string",
+}
+QUOTA_COLUMNS = {
+    "employee_id": "string",
+    "annual_allowance": "int32",
+    "carried_over": "int32",
+    "taken_to_date": "int32",
+    "remaining_leaves": "int32",
+    "updated_at": "string",
+}
+EVENT_COLUMNS = {
+    "request_id": "string",
+    "employee_id": "string",
+    "leave_type": "string",
+    "start_date": "string",
+    "end_date": "string",
+    "days": "int32",
+    "event_type": "string",
+    "status": "string",
+    "created_at": "string",
+    "approved_at": "string",
+}
+
+
+# Rows parsed per chunk when streaming a seed CSV
+CSV_CHUNK_SIZE = 10_000
+
+
+def _read_csv(csv_path: Path, columns: dict, **kwargs):
+    """Read only the given columns of a seed CSV with explicit dtypes."""
+    return pd.read_csv(
+        csv_path,
+        usecols=lambda column: column in columns,
+        dtype=columns,
+        keep_default_na=False,
+        **kwargs,
+    )
+
+
+def _put_items(storage, table: str, items: list) -> int:
+    """Write all items of a table in one batch call."""
+    storage.batch_write_item({table: [{"PutRequest": {"Item": item}} for item in items]})
+    return len(items)
+
 
 def seed_engineers(storage, csv_path: Path, limit: int = 30) -> int:
     """Seed engineer availability data."""
     print(f"📊 Loading engineers from {csv_path} (limit: {limit})...")
-    df = pd.read_csv(csv_path)
-    
-    # Limit to reduce context size
-    df = df.head(limit)
-    
-    count = 0
-    for _, row in df.iterrows():
-        item = {
+    # Limit to reduce context size; only the needed rows are parsed
+    df = _read_csv(csv_path, ENGINEER_COLUMNS, nrows=limit)
+    
+    # Display names ("adam-solomon" -> "Adam Solomon") are stored so the
+    # /employees endpoint doesn't derive them on every request
+    names = df["employee_id"].str.replace("-", " ").str.title()
+    items = [
+        {
             "employee_id": str(row["employee_id"]),
+            "name": name,
             "department": str(row.get("department", "Engineering")),
             "position": str(row.get("position", "Engineer")),
             "status": str(row.get("status", "ACTIVE")),
             "is_available": True if row.get("status") == "ACTIVE" else False,
             "updated_at": str(row.get("updated_at", "")),
         }
-        
-        storage.put_item("EngineerAvailability", item)
-        count += 1
+        for row, name in zip(df.to_dict(orient="records"), names)
+    ]
+    count = _put_items(storage, "EngineerAvailability", items)
     
     print(f"✅ Seeded {count} engineers")
     return count
@@ -49,30 +101,22 @@ def seed_engineers(storage, csv_path: Path, limit: int = 30) -> int:
 def seed_leave_quotas(storage, csv_path: Path, limit: int = 30) -> int:
     """Seed leave quota data."""
     print(f"📊 Loading leave quotas from {csv_path} (limit: {limit})...")
-    df = pd.read_csv(csv_path)
-    
-    # Limit to reduce context size
-    df = df.head(limit)
+    # Limit to reduce context size; only the needed rows are parsed
+    df = _read_csv(csv_path, QUOTA_COLUMNS, nrows=limit)
     
-    count = 0
-    for _, row in df.iterrows():
-        annual_allowance = int(row.get("annual_allowance", 20))
-        carried_over = int(row.get("carried_over", 0))
-        taken_to_date = int(row.get("taken_to_date", 0))
-        remaining = int(row.get("remaining_leaves", 0))
-        
-        item = {
+    items = [
+        {
             "employee_id": str(row["employee_id"]),
-            "annual_quota": annual_allowance,
-            "carried_over": carried_over,
-            "used_days": taken_to_date,
-            "available_days": remaining,
+            "annual_quota": int(row.get("annual_allowance", 20)),
+            "carried_over": int(row.get("carried_over", 0)),
+            "used_days": int(row.get("taken_to_date", 0)),
+            "available_days": int(row.get("remaining_leaves", 0)),
             "year": 2024,
             "updated_at": str(row.get("updated_at", "")),
         }
-        
-        storage.put_item("LeaveQuota", item)
-        count += 1
+        for row in df.to_dict(orient="records")
+    ]
+    count = _put_items(storage, "LeaveQuota", items)
     
     print(f"✅ Seeded {count} leave quotas")
     return count
@@ -81,25 +125,25 @@ def seed_leave_quotas(storage, csv_path: Path, limit: int = 30) -> int:
 def seed_leave_events(storage, csv_path: Path, limit: int = 100) -> int:
     """Seed leave events data."""
     print(f"📊 Loading leave events from {csv_path} (limit: {limit})...")
-    df = pd.read_csv(csv_path)
-    
-    # Limit the number of events for initial seed
-    df = df.head(limit)
-    
-    count = 0
-    processed_requests = set()
-    
-    for _, row in df.iterrows():
-        request_id = str(row.get("request_id", f"req-{count}"))
-        
-        # Skip duplicate request IDs (multiple events per request)
-        if request_id in processed_requests:
-            continue
-        
-        processed_requests.add(request_id)
-        
-        item = {
-            "request_id": request_id,
+    # Keep the first event of each request (there are several events per
+    # request), then limit the number of requests for the initial seed.
+    # The file is read in chunks and parsing stops once enough are found.
+    chunks = []
+    seen = set()
+    with _read_csv(csv_path, EVENT_COLUMNS, chunksize=CSV_CHUNK_SIZE) as reader:
+        for chunk in reader:
+            # Only requests not already kept from an earlier chunk
+            chunk = chunk[~chunk["request_id"].isin(seen)].drop_duplicates(subset="request_id", keep="first")
+            chunk = chunk.head(limit - len(seen))
+            chunks.append(chunk)
+            seen.update(chunk["request_id"])
+            if len(seen) >= limit:
+                break
+    df = pd.concat(chunks) if chunks else pd.DataFrame()
+    
+    items = [
+        {
+            "request_id": str(row["request_id"]),
             "employee_id": str(row["employee_id"]),
             "leave_type": str(row.get("leave_type", "Annual Leave")),
             "start_date": str(row.get("start_date", "")),
@@ -110,10 +154,10 @@ def seed_leave_events(storage, csv_path: Path, limit: int = 100) -> int:
             "created_at": str(row.get("created_at", "")),
             "approved_at": str(row.get("approved_at", "")),
         }
-        
-        storage.put_item("LeaveRequests", item)
-        count += 1
+        for row in df.to_dict(orient="records")
+    ]
     
+    count = _put_items(storage, "LeaveRequests", items)
     print(f"✅ Seeded {count} leave requests")
     return count
 
@@ -9,17 +9,20 @@ This script checks:
 """
 from __future__ import annotations
 
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import boto3
 from kafka import KafkaProducer
 
-from src.config import load as load_config
+from scripts.check_runner import run_checks
+from src.config import get_client, load as load_config
 
 
 def test_config() -> bool:
@@ -40,16 +43,17 @@ def test_dynamodb(cfg) -> bool:
     """Test DynamoDB table access."""
     print("\nTesting DynamoDB tables...")  # noqa: T201
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=cfg.region)
+        dynamodb = get_client("dynamodb", cfg.region)
         tables = [
             cfg.dynamodb_engineer_table,
             cfg.dynamodb_quota_table,
             cfg.dynamodb_request_table,
         ]
-        for table_name in tables:
-            table = dynamodb.Table(table_name)
-            table.load()
-            print(f"✓ Table {table_name} exists")  # noqa: T201
+        # Describe the tables concurrently; results come back in table order
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            descriptions = executor.map(lambda name: dynamodb.describe_table(TableName=name), tables)
+            for table_name, _ in zip(tables, descriptions):
+                print(f"✓ Table {table_name} exists")  # noqa: T201
         return True
     except Exception as e:
         print(f"✗ DynamoDB error: {e}")  # noqa: T201
@@ -57,15 +61,22 @@ def test_dynamodb(cfg) -> bool:
         return False
 
 
+@lru_cache(maxsize=None)
+def _producer(bootstrap: str) -> KafkaProducer:
+    """Return a producer per bootstrap string, built once and reused across checks."""
+    # Construction does the broker handshake; kafka-python closes it at exit
+    return KafkaProducer(
+        bootstrap_servers=bootstrap.split(","),
+        value_serializer=lambda v: v.encode("utf-8"),
+    )
+
+
 def test_kafka(cfg) -> bool:
     """Test Kafka connection."""
     print("\nTesting Kafka connection...")  # noqa: T201
     try:
-        producer = KafkaProducer(
-            bootstrap_servers=cfg.kafka_bootstrap.split(","),
-            value_serializer=lambda v: v.encode("utf-8"),
-        )
-        producer.close()
+        if not _producer(cfg.kafka_bootstrap).bootstrap_connected():
+            raise ConnectionError(f"not connected to {cfg.kafka_bootstrap}")
         print(f"✓ Kafka connection successful ({cfg.kafka_bootstrap})")  # noqa: T201
         return True
     except Exception as e:
@@ -74,12 +85,16 @@ def test_kafka(cfg) -> bool:
         return False
 
 
-def test_gemini() -> bool:
-    """Test Gemini integration."""
+def test_gemini(deep: bool = False) -> bool:
+    """Test Gemini integration; only issues a real generation call when ``deep`` is set."""
     print("\nTesting Gemini integration...")  # noqa: T201
     try:
         from src.agent.gemini_client import GeminiLLM
         llm = GeminiLLM()
+        if not deep:
+            llm.ping()
+            print(f"✓ Gemini credentials and model {llm.model} are valid")  # noqa: T201
+            return True
         response = llm.invoke("Say 'OK' if you can hear me.")
         if "OK" in response.upper() or len(response) > 0:
             print(f"✓ Gemini integration is working")  # noqa: T201
@@ -93,7 +108,7 @@ def test_gemini() -> bool:
         return False
 
 
-def main() -> None:
+def main(deep: bool = False) -> None:
     """Run all tests."""
     print("=" * 50)  # noqa: T201
     print("Leave Management System - Setup Test")  # noqa: T201
@@ -104,10 +119,15 @@ def main() -> None:
 
     cfg = load_config()
 
-    results = []
-    results.append(("DynamoDB", test_dynamodb(cfg)))
-    results.append(("Kafka", test_kafka(cfg)))
-    results.append(("Gemini", test_gemini()))
+    tasks = {
+        "DynamoDB": lambda: test_dynamodb(cfg),
+        "Kafka": lambda: test_kafka(cfg),
+        "Gemini": lambda: test_gemini(deep),
+    }
+
+    # The tests are independent and network-bound, so run them concurrently
+    # and replay their output in the original order.
+    results = list(run_checks(tasks).items())
 
     print("\n" + "=" * 50)  # noqa: T201
     print("Test Summary:")  # noqa: T201
@@ -125,6 +145,13 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Verify the leave management setup.")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Run a real Gemini generation call instead of a metadata check",
+    )
+    args = parser.parse_args()
+    main(args.deep)
 
 
@@ -1,4 +1,16 @@
 """Conversational agent utilities and Lambda handlers."""
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from .gemini_client import GeminiLLM
 
+
+def __getattr__(name: str):
+    # Resolve GeminiLLM on first access so importing the package stays cheap
+    if name == "GeminiLLM":
+        from .gemini_client import GeminiLLM
+
+        return GeminiLLM
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,24 +3,63 @@ Admin-specific service functions for leave management system.
 """
 from __future__ import annotations
 
-import json
 import os
+from operator import itemgetter
 from typing import Any, Dict, List
 
+from src.agent.http_utils import TTLCache, dumps
 from src.storage.s3_storage import S3Storage
 
+# Built once per Lambda execution environment and reused by warm invocations
+_BUCKET = os.environ.get("LEAVE_MGMT_S3_BUCKET", "")
+_STORAGE = S3Storage(_BUCKET) if _BUCKET else None
+
+# The roster changes rarely, so the serialized /employees body is reused
+# for EMPLOYEE_CACHE_TTL seconds instead of rescanning on every request
+EMPLOYEE_CACHE_TTL = 60.0
+_employee_cache: TTLCache[str] = TTLCache(EMPLOYEE_CACHE_TTL)
+
 
 def get_employee_list(storage: S3Storage) -> List[Dict[str, Any]]:
     """Get list of all employees for dropdown selection."""
-    engineers = storage.scan("EngineerAvailability")
-    employees = []
-    for item in engineers:
-        employees.append({
-            "id": item.get("employee_id"),
-            "name": item.get("employee_id").replace("-", " ").title(),
+    employees = [
+        {
+            "id": item["employee_id"],
+            "name": item.get("name") or item["employee_id"].replace("-", " ").title(),
             "status": item.get("current_status", "AVAILABLE"),
-        })
-    return sorted(employees, key=lambda x: x["name"])
+        }
+        for item in storage.scan("EngineerAvailability")
+    ]
+    employees.sort(key=itemgetter("name"))
+    return employees
+
+
+def get_employee_list_body(storage: S3Storage) -> str:
+    """Return the JSON body for the employee list, cached for EMPLOYEE_CACHE_TTL seconds."""
+    return _employee_cache.get(lambda: dumps({"employees": get_employee_list(storage)}))
+
+
+# Fixed responses, built once and returned as-is; callers never mutate them
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_PREFLIGHT_RESPONSE = {
+    "statusCode": 200,
+    "headers": {
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type",
+    },
+    "body": "",
+}
+_NO_BUCKET_RESPONSE = {
+    "statusCode": 500,
+    "headers": _CORS_HEADERS,
+    "body": dumps({"error": "S3 bucket not configured"}),
+}
+_NOT_FOUND_RESPONSE = {
+    "statusCode": 404,
+    "headers": _CORS_HEADERS,
+    "body": dumps({"error": "Not found"}),
+}
 
 
 def lambda_handler(event: Dict[str, Any], _context) -> Dict[str, Any]:
@@ -29,37 +68,19 @@ def lambda_handler(event: Dict[str, Any], _context) -> Dict[str, Any]:
     """
     # Handle CORS
     if event.get("httpMethod") == "OPTIONS":
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type",
-            },
-            "body": "",
-        }
+        return _PREFLIGHT_RESPONSE
     
-    bucket = os.environ.get("LEAVE_MGMT_S3_BUCKET", "")
-    if not bucket:
-        return {
-            "statusCode": 500,
-            "headers": {"Access-Control-Allow-Origin": "*"},
-            "body": json.dumps({"error": "S3 bucket not configured"}),
-        }
+    if _STORAGE is None:
+        return _NO_BUCKET_RESPONSE
     
-    storage = S3Storage(bucket)
+    storage = _STORAGE
     
     path = event.get("path", "")
     if path == "/employees" or event.get("action") == "get_employees":
-        employees = get_employee_list(storage)
         return {
             "statusCode": 200,
-            "headers": {"Access-Control-Allow-Origin": "*"},
-            "body": json.dumps({"employees": employees}),
+            "headers": _CORS_HEADERS,
+            "body": get_employee_list_body(storage),
         }
     
-    return {
-        "statusCode": 404,
-        "headers": {"Access-Control-Allow-Origin": "*"},
-        "body": json.dumps({"error": "Not found"}),
-    }
+    return _NOT_FOUND_RESPONSE
@@ -17,9 +17,10 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict
 
-from google import genai
+if TYPE_CHECKING:
+    from google import genai
 
 # Try relative imports first (for local dev), then absolute imports (for Lambda)
 try:
@@ -29,6 +30,52 @@ except ImportError:
     from prompt_builder import command_prompt, narrative_prompt
 
 
+# Patterns used on every command parse, compiled once
+_JSON_RE = re.compile(r"\{[\s\S]*\}")
+_FENCE_OPEN_RE = re.compile(r'```json\s*')
+_FENCE_CLOSE_RE = re.compile(r'```\s*$')
+_TRAILING_COMMA_BRACE_RE = re.compile(r',\s*}')
+_TRAILING_COMMA_BRACKET_RE = re.compile(r',\s*]')
+_UNQUOTED_BEFORE_COMMA_RE = re.compile(r'([^"]),')
+_UNQUOTED_BEFORE_BRACE_RE = re.compile(r'([^"])}')
+
+# Output schema for command(); Gemini constrains its JSON to this shape
+_COMMAND_SCHEMA: Dict[str, Any] = {
+    "type": "OBJECT",
+    "properties": {
+        "action": {"type": "STRING"},
+        "employee_id": {"type": "STRING", "nullable": True},
+        "parameters": {
+            "type": "OBJECT",
+            "properties": {
+                "start_date": {"type": "STRING"},
+                "end_date": {"type": "STRING"},
+                "leave_type": {"type": "STRING"},
+                "days": {"type": "INTEGER"},
+                "error": {"type": "STRING"},
+            },
+        },
+    },
+    "required": ["action", "employee_id", "parameters"],
+}
+
+# Static system instructions, sent unchanged on every call of their kind
+_COMMAND_SYSTEM = """You are a helpful assistant that parses user requests into structured JSON commands.
+CRITICAL: Respond with ONLY valid JSON. No explanations, no markdown, no extra text.
+The JSON must contain: action, employee_id, and parameters.
+Use double quotes for all strings. Escape any quotes inside strings.
+Example valid response: {"action": "query_balance", "employee_id": "john-doe", "parameters": {}}"""
+
+_ADMIN_NARRATIVE_SYSTEM = """You are a professional assistant for a leave management system admin interface.
+Generate clear, objective, and impersonal responses about employee leave data and team statistics.
+Use third-person language (e.g., "The employee has..." not "You have...").
+Keep responses brief, factual, and professional. Do not use personal greetings or names."""
+
+_USER_NARRATIVE_SYSTEM = """You are a helpful assistant for a leave management system.
+Generate clear, concise, and friendly responses to users about their leave requests and balances.
+Keep responses professional but conversational. Be brief and to the point."""
+
+
 class GeminiLLM:
     """
     High-level wrapper around Gemini chat completion for this project.
@@ -51,9 +98,21 @@ class GeminiLLM:
             )
 
         self.model = model or os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+        # The SDK is heavy to import, so it is only loaded once a client is
+        # actually needed; requests that never call Gemini skip it entirely.
+        from google import genai
+
         # The Client will pick up GOOGLE_API_KEY automatically, but we pass it
         # explicitly so it also works with GEMINI_API_KEY.
-        self._client = genai.Client(api_key=api_key)
+        self._client: genai.Client = genai.Client(api_key=api_key)
+
+    def ping(self) -> None:
+        """
+        Check that the API key and model are valid without generating content.
+
+        Fetches the model metadata, which costs no generation quota; raises on failure.
+        """
+        self._client.models.get(model=self.model)
 
     def invoke(
         self,
@@ -61,28 +120,36 @@ class GeminiLLM:
         temperature: float = 0.2,
         max_tokens: int = 512,
         system_prompt: str | None = None,
+        response_mime_type: str | None = None,
+        response_schema: Dict[str, Any] | None = None,
     ) -> str:
         """
         Call Gemini with a simple text prompt and optional system message.
 
+        ``response_mime_type`` / ``response_schema`` constrain the output format
+        (e.g. JSON matching a schema).
+
         Returns:
             Generated text response.
         """
-        # The google-genai SDK expects contents to be a string.
-        # If we have a system prompt, prepend it to the user prompt.
-        contents: str
+        config: Dict[str, Any] = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+        # Passing the system prompt as a system instruction (rather than
+        # prepending it to the prompt) keeps the static prefix identical across
+        # calls, so Gemini's implicit prompt caching can apply to it.
         if system_prompt:
-            contents = f"{system_prompt}\n\n{prompt}"
-        else:
-            contents = prompt
+            config["system_instruction"] = system_prompt
+        if response_mime_type:
+            config["response_mime_type"] = response_mime_type
+        if response_schema:
+            config["response_schema"] = response_schema
 
         response = self._client.models.generate_content(
             model=self.model,
-            contents=contents,
-            config={
-                "temperature": temperature,
-                "max_output_tokens": max_tokens,
-            },
+            contents=prompt,
+            config=config,
         )
 
         # Try to extract text from response
@@ -134,12 +201,6 @@ class GeminiLLM:
         """
         prompt = command_prompt(user_message)
 
-        system_prompt = """You are a helpful assistant that parses user requests into structured JSON commands.
-CRITICAL: Respond with ONLY valid JSON. No explanations, no markdown, no extra text.
-The JSON must contain: action, employee_id, and parameters.
-Use double quotes for all strings. Escape any quotes inside strings.
-Example valid response: {"action": "query_balance", "employee_id": "john-doe", "parameters": {}}"""
-
         # Try up to 2 times to get valid JSON
         for attempt in range(2):
             try:
@@ -147,11 +208,19 @@ Example valid response: {"action": "query_balance", "employee_id": "john-doe", "
                     prompt,
                     temperature=0.05 if attempt == 1 else 0.1,  # Lower temp on retry
                     max_tokens=256,
-                    system_prompt=system_prompt,
+                    system_prompt=_COMMAND_SYSTEM,
+                    response_mime_type="application/json",
+                    response_schema=_COMMAND_SCHEMA,
                 )
 
-                # Robustly extract JSON from the response
-                match = re.search(r"\{[\s\S]*\}", raw)
+                # Schema-constrained output is bare JSON, so this normally succeeds
+                try:
+                    return json.loads(raw)
+                except json.JSONDecodeError:
+                    pass
+
+                # Fallback (e.g. output cut off at the token limit): extract and repair
+                match = _JSON_RE.search(raw)
                 if match:
                     json_str = match.group(0)
                     # Clean up common JSON issues
@@ -201,13 +270,13 @@ Example valid response: {"action": "query_balance", "employee_id": "john-doe", "
     def _clean_json(self, json_str: str) -> str:
         """Clean common JSON formatting issues."""
         # Remove any markdown code block markers
-        json_str = re.sub(r'```json\s*', '', json_str)
-        json_str = re.sub(r'```\s*$', '', json_str)
+        json_str = _FENCE_OPEN_RE.sub('', json_str)
+        json_str = _FENCE_CLOSE_RE.sub('', json_str)
         json_str = json_str.strip()
         
         # Remove trailing commas before closing braces/brackets
-        json_str = re.sub(r',\s*}', '}', json_str)
-        json_str = re.sub(r',\s*]', ']', json_str)
+        json_str = _TRAILING_COMMA_BRACE_RE.sub('}', json_str)
+        json_str = _TRAILING_COMMA_BRACKET_RE.sub(']', json_str)
         
         # Fix common string termination issues
         # If there's an unterminated string, try to find and fix it
@@ -219,8 +288,8 @@ Example valid response: {"action": "query_balance", "employee_id": "john-doe", "
             if quote_count % 2 != 0 and not line.strip().endswith('"'):
                 # Try to add closing quote before comma or brace
                 if ',' in line or '}' in line:
-                    line = re.sub(r'([^"]),', r'\1",', line)
-                    line = re.sub(r'([^"])}', r'\1"}', line)
+                    line = _UNQUOTED_BEFORE_COMMA_RE.sub(r'\1",', line)
+                    line = _UNQUOTED_BEFORE_BRACE_RE.sub(r'\1"}', line)
             fixed_lines.append(line)
         
         return '\n'.join(fixed_lines)
@@ -231,15 +300,7 @@ Example valid response: {"action": "query_balance", "employee_id": "john-doe", "
         """
         prompt = narrative_prompt(command, data_payload)
 
-        if is_admin:
-            system_prompt = """You are a professional assistant for a leave management system admin interface.
-Generate clear, objective, and impersonal responses about employee leave data and team statistics.
-Use third-person language (e.g., "The employee has..." not "You have...").
-Keep responses brief, factual, and professional. Do not use personal greetings or names."""
-        else:
-            system_prompt = """You are a helpful assistant for a leave management system.
-Generate clear, concise, and friendly responses to users about their leave requests and balances.
-Keep responses professional but conversational. Be brief and to the point."""
+        system_prompt = _ADMIN_NARRATIVE_SYSTEM if is_admin else _USER_NARRATIVE_SYSTEM
 
         try:
             return self.invoke(
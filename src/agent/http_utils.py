@@ -0,0 +1,44 @@
+"""Response helpers shared by the agent and admin Lambda handlers."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Generic, Tuple, TypeVar
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional; responses fall back to the stdlib encoder
+
+T = TypeVar("T")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+class TTLCache(Generic[T]):
+    """One value, recomputed at most once every ``ttl`` seconds.
+
+    Warm Lambda invocations reuse the value; the lock lets concurrent
+    requests (e.g. under local_api's threaded server) share one computation.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entry: Tuple[float, T] | None = None
+        self._lock = threading.Lock()
+
+    def get(self, compute: Callable[[], T], refresh: bool = False) -> T:
+        """Return the cached value, calling ``compute`` if it is missing, stale or ``refresh`` is set."""
+        with self._lock:
+            now = time.monotonic()
+            if not refresh and self._entry is not None and now - self._entry[0] < self.ttl:
+                return self._entry[1]
+            value = compute()
+            self._entry = (now, value)
+            return value
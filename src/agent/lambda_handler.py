@@ -1,66 +1,139 @@
 """AWS Lambda entry point wrapping the agent service."""
 from __future__ import annotations
 
+import base64
 import json
-from typing import Any, Dict
+from operator import itemgetter
+from typing import Any, Dict, List
 import os
 
+from botocore.exceptions import ClientError
+
 # Try relative imports first (for local dev), then absolute imports (for Lambda)
 try:
-    from .service import handle_user_message
-    from ..storage.dynamodb_storage import create_storage
+    from .http_utils import TTLCache, dumps
+    from .service import get_llm, get_storage, handle_user_message
+    from ..storage.dynamodb_storage import EMPLOYEE_ENTITY_TYPE, EMPLOYEE_INDEX
 except ImportError:
     # Absolute imports for Lambda deployment
-    from service import handle_user_message
-    from storage.dynamodb_storage import create_storage
+    from http_utils import TTLCache, dumps
+    from service import get_llm, get_storage, handle_user_message
+    from storage.dynamodb_storage import EMPLOYEE_ENTITY_TYPE, EMPLOYEE_INDEX
+
+
+# The roster changes rarely, so warm invocations reuse the serialized
+# /employees body for EMPLOYEE_CACHE_TTL seconds instead of re-reading it
+EMPLOYEE_CACHE_TTL = 60.0
+_employee_cache: TTLCache[str] = TTLCache(EMPLOYEE_CACHE_TTL)
+
+
+def warmup() -> None:
+    """Create the DynamoDB client and table handles before the first request arrives.
+
+    The Gemini client (and the google-genai import) is left to the first chat
+    request, so containers that only serve /employees never load the SDK, unless
+    LEAVE_MGMT_WARM_LLM=1 asks for it up front.
+    """
+    get_storage().preload_tables(["EngineerAvailability", "LeaveQuota", "LeaveRequests"])
+    if os.getenv("LEAVE_MGMT_WARM_LLM") == "1":
+        get_llm()
+
+
+# Response headers (with CORS since Function URL CORS is disabled); built once
+# and shared by every response, which never mutates them
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With"
+}
+
+# Last path segments served by GET /employees ("" is the root path); matching
+# only the last segment lets a stage or proxy prefix such as /prod/employees through
+_EMPLOYEE_ROUTES = frozenset({"", "employees"})
 
 
 def get_headers():
     """Return headers for responses (with CORS since Function URL CORS is disabled)."""
-    return {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With"
-    }
+    return _HEADERS
 
 
-def get_employees_handler():
-    """Handle GET /employees endpoint."""
+# Fixed responses, built once and returned as-is; callers never mutate them
+_PREFLIGHT_RESPONSE = {
+    "statusCode": 200,
+    "headers": _HEADERS,
+    "body": "OK"
+}
+_NOT_FOUND_RESPONSE = {
+    "statusCode": 404,
+    "headers": _HEADERS,
+    "body": dumps({"error": "Route not found"})
+}
+
+
+def _list_employees(storage) -> List[Dict[str, Any]]:
+    """Read the roster from the entity_type GSI.
+
+    The index is authoritative: employees are seeded with entity_type, so items
+    written before it existed must be backfilled (re-run seed_dynamodb.py).
+    Only tables created before the index existed fall back to a table scan.
+    """
+    try:
+        return storage.query(
+            "EngineerAvailability",
+            index_name=EMPLOYEE_INDEX,
+            key_condition={"entity_type": EMPLOYEE_ENTITY_TYPE},
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] not in ("ValidationException", "ResourceNotFoundException"):
+            raise
+        return storage.scan("EngineerAvailability")
+
+
+def get_employees_handler(refresh: bool = False):
+    """Handle GET /employees endpoint; ``refresh`` bypasses the cached body."""
     try:
-        storage = create_storage()
-        employees = storage.scan("EngineerAvailability")
-        
-        # Limit to 30 engineers to reduce context size
-        employees = employees[:30]
-        
-        # Format for frontend dropdown
-        employees_list = []
-        for emp in employees:
-            emp_id = emp["employee_id"]
-            # Convert "adam-solomon" to "Adam Solomon"
-            name = emp_id.replace("-", " ").title()
-            employees_list.append({
-                "id": emp_id,
-                "name": name,
-                "department": emp.get("department", "Unknown"),
-                "status": emp.get("current_status", "AVAILABLE")
-            })
-        
-        # Sort by name
-        employees_list.sort(key=lambda x: x["name"])
-        
         return {
             "statusCode": 200,
             "headers": get_headers(),
-            "body": json.dumps({"employees": employees_list})
+            "body": _get_employees_body(refresh),
         }
     except Exception as e:
         return {
             "statusCode": 500,
             "headers": get_headers(),
-            "body": json.dumps({"error": f"Failed to fetch employees: {str(e)}"})
+            "body": dumps({"error": f"Failed to fetch employees: {str(e)}"})
+        }
+
+
+def _get_employees_body(refresh: bool = False) -> str:
+    """Return the JSON body for GET /employees, cached for EMPLOYEE_CACHE_TTL seconds."""
+    return _employee_cache.get(_build_employees_body, refresh)
+
+
+def _build_employees_body() -> str:
+    """Read the roster and serialize it for GET /employees."""
+    storage = get_storage()
+    employees = _list_employees(storage)
+    
+    # Limit to 30 engineers to reduce context size
+    employees = employees[:30]
+    
+    # Format for frontend dropdown; items seeded without a stored name
+    # show "adam-solomon" as "Adam Solomon"
+    employees_list = [
+        {
+            "id": (emp_id := emp["employee_id"]),
+            "name": emp.get("name") or emp_id.replace("-", " ").title(),
+            "status": emp.get("current_status", "AVAILABLE"),
         }
+        for emp in employees
+    ]
+    
+    # Sort by name
+    employees_list.sort(key=itemgetter("name"))
+    
+    return dumps({"employees": employees_list})
 
 
 def chat_handler(payload: Dict[str, Any]):
@@ -70,24 +143,30 @@ def chat_handler(payload: Dict[str, Any]):
         return {
             "statusCode": 400,
             "headers": get_headers(),
-            "body": json.dumps({"error": "Missing 'message'"}),
+            "body": dumps({"error": "Missing 'message'"}),
         }
     
     employee_id = payload.get("employee_id")
     is_admin = payload.get("is_admin", False)
     
     try:
-        result = handle_user_message(message, employee_id=employee_id, is_admin=is_admin)
+        result = handle_user_message(
+            message,
+            employee_id=employee_id,
+            is_admin=is_admin,
+            storage=get_storage(),
+            llm=get_llm(),
+        )
         return {
             "statusCode": 200,
             "headers": get_headers(),
-            "body": json.dumps(result),
+            "body": dumps(result),
         }
     except Exception as e:
         return {
             "statusCode": 500,
             "headers": get_headers(),
-            "body": json.dumps({"error": str(e)}),
+            "body": dumps({"error": str(e)}),
         }
 
 
@@ -95,23 +174,23 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda function handler."""
     try:
         # Extract HTTP method
-        http_method = event.get("requestContext", {}).get("http", {}).get("method") or event.get("httpMethod", "POST")
-        raw_path = event.get("requestContext", {}).get("http", {}).get("path") or event.get("path", "")
+        request_http = (event.get("requestContext") or {}).get("http") or {}
+        http_method = request_http.get("method") or event.get("httpMethod", "POST")
+        raw_path = request_http.get("path") or event.get("path", "")
 
         # Handle OPTIONS for CORS preflight
         if http_method == "OPTIONS":
-            return {
-                "statusCode": 200,
-                "headers": get_headers(),
-                "body": "OK"
-            }
+            return _PREFLIGHT_RESPONSE
 
         # Route: GET /employees
-        if http_method == "GET" and ("employee" in raw_path.lower() or raw_path == "/"):
-            return get_employees_handler()
+        if http_method == "GET" and raw_path.rstrip("/").rsplit("/", 1)[-1].lower() in _EMPLOYEE_ROUTES:
+            query = event.get("queryStringParameters") or {}
+            return get_employees_handler(refresh=query.get("refresh") == "1")
 
         # Parse request body for POST
         body = event.get("body", "{}")
+        if event.get("isBase64Encoded") and isinstance(body, str):
+            body = base64.b64decode(body).decode("utf-8")
         if isinstance(body, str):
             try:
                 body = json.loads(body)
@@ -133,11 +212,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return chat_handler(body)
             
         # Unknown route/method
-        return {
-            "statusCode": 404,
-            "headers": get_headers(),
-            "body": json.dumps({"error": "Route not found"})
-        }
+        return _NOT_FOUND_RESPONSE
 
     except Exception as e:
         print(f"Error in lambda_handler: {str(e)}")
@@ -147,8 +222,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {
             "statusCode": 500,
             "headers": get_headers(),
-            "body": json.dumps({
+            "body": dumps({
                 "error": str(e),
                 "message": "Internal server error"
             })
         }
+
+
+# Lambda runs module scope during INIT, so build the clients there and let
+# warm invocations reuse them. A failure (e.g. a missing API key in local
+# dev) is not fatal here; it resurfaces on the first request that needs it.
+try:
+    warmup()
+except Exception as exc:
+    print(f"Warmup skipped: {exc}")
@@ -7,116 +7,123 @@ bidirectionally:
 """
 from __future__ import annotations
 
+import json
+import re
 from textwrap import dedent
 from typing import Dict
 
+# Admin requests are tagged in the message itself, in any letter case
+_ADMIN_TAG = re.compile(r"\[ADMIN_MODE\]", re.IGNORECASE)
+
+
+# Dedented once at import; only .format() runs per request
+_COMMAND_TEMPLATE = dedent(
+    """
+    You are a leave-management assistant. Translate the user request into a JSON command.
+    
+    Schema for VALID requests:
+    {{
+      "action": {actions},
+      "employee_id": "string (required for user actions, optional for admin)",
+      "parameters": {{
+         "start_date": "YYYY-MM-DD (optional, for leave requests, cancellation, or availability check)",
+         "end_date": "YYYY-MM-DD (optional, for leave requests or availability check)",
+         "leave_type": "string (optional, e.g., 'Sick Leave', 'Vacation')",
+         "days": "integer (optional, calculated from dates if not provided)"
+      }}
+    }}
+
+    Schema for IMPOSSIBLE/AMBIGUOUS requests:
+    {{
+      "action": "error",
+      "employee_id": "string (optional)",
+      "parameters": {{
+         "error": "string (explanation of why the request cannot be processed)"
+      }}
+    }}
+
+    Available actions:
+    - query_balance: Get employee's remaining leave days
+    - request_leave: Request leave for an employee
+    - cancel_leave: Cancel an existing leave request. 'start_date' is optional if the employee has only one active leave.
+    - list_requests: List leave requests. Admin: lists all (or filtered by employee_id). User: lists their own.
+    - get_all_employees: Get all employees with their status (admin only). Use this for "Who is on leave?", "Show all employees".
+    - get_availability_stats: Get availability statistics (admin only)
+    - check_availability_for_date: Check who is on leave for a specific date or date range.
+    
+    Date handling:
+    - Convert ALL dates to ISO 8601 format (YYYY-MM-DD)
+    - Handle date formats: "20/11", "20/11/2025", "Nov 20", "20-11-2025" → convert to "2025-11-20"
+    - Assume current year (2025) if year not specified
+    - Assume MM/DD format for slash dates (US format)
+    - "tomorrow" = today + 1 day
+    - "next Monday" = calculate next Monday's date
+    - "from tomorrow for 2 days" = tomorrow as start_date, tomorrow+1 as end_date
+    - "2 days from tomorrow" = tomorrow as start_date, tomorrow+1 as end_date
+    - "2 days starting tomorrow" = tomorrow as start_date, tomorrow+1 as end_date
+    - "3 days from 20/11 to 22/11" = start_date: "2025-11-20", end_date: "2025-11-22"
+    - If only days mentioned (e.g., "5 days"), use "days": 5, omit dates
+    - Always calculate actual dates when possible
+
+    Constraints & Rules:
+    - There are 30 engineers total; at least 20 must remain available.
+    - Dates must be ISO 8601 format (YYYY-MM-DD).
+    - Omit optional parameters when not provided.{admin_note}
+    - Extract employee_id from the message if present, otherwise use the one from context.
+    - Today's date is: {today} - use this for calculating relative dates like "tomorrow"
+    - Employee IDs are in format "firstname-lastname" (e.g., "adam-solomon").
+    - When user mentions just a first name (e.g., "Adam"), extract it as employee_id: "adam" (lowercase).
+    - The backend will resolve partial names to full employee IDs.
+    - "Who has leave requests?" -> list_requests
+    - "Who is on leave?" -> get_all_employees (or check_availability_for_date if date specified)
+    - "active leave requests" -> list_requests
+
+    Examples:
+    1. User: "cancel robert jones leave"
+       Output: {{ "action": "cancel_leave", "employee_id": "robert-jones", "parameters": {{}} }}
+    
+    2. User: "Who has leave requests?" (Admin)
+       Output: {{ "action": "list_requests", "employee_id": null, "parameters": {{}} }}
+
+    Output ONLY minified JSON, nothing else.
+    
+    User: {message}
+    """
+)
+
 
 def command_prompt(user_message: str) -> str:
     """Return a prompt instructing the model to emit JSON only."""
     from datetime import datetime
     
-    is_admin = "[ADMIN_MODE]" in user_message.upper()
+    is_admin = _ADMIN_TAG.search(user_message) is not None
     today = datetime.now().strftime("%Y-%m-%d")
     
     if is_admin:
         actions = '"query_balance" | "request_leave" | "cancel_leave" | "list_requests" | "get_all_employees" | "get_availability_stats" | "check_availability_for_date"'
-        admin_note = "\n        - Admin mode: You can query all employees, view availability stats, and manage any employee's leave."
+        admin_note = "\n- Admin mode: You can query all employees, view availability stats, and manage any employee's leave."
     else:
         actions = '"query_balance" | "request_leave" | "cancel_leave" | "list_requests" | "check_availability_for_date"'
         admin_note = ""
     
-    template = dedent(
-        f"""
-        You are a leave-management assistant. Translate the user request into a JSON command.
-        
-        Schema for VALID requests:
-        {{{{
-          "action": {actions},
-          "employee_id": "string (required for user actions, optional for admin)",
-          "parameters": {{{{
-             "start_date": "YYYY-MM-DD (optional, for leave requests, cancellation, or availability check)",
-             "end_date": "YYYY-MM-DD (optional, for leave requests or availability check)",
-             "leave_type": "string (optional, e.g., 'Sick Leave', 'Vacation')",
-             "days": "integer (optional, calculated from dates if not provided)"
-          }}}}
-        }}}}
-
-        Schema for IMPOSSIBLE/AMBIGUOUS requests:
-        {{{{
-          "action": "error",
-          "employee_id": "string (optional)",
-          "parameters": {{{{
-             "error": "string (explanation of why the request cannot be processed)"
-          }}}}
-        }}}}
-
-        Available actions:
-        - query_balance: Get employee's remaining leave days
-        - request_leave: Request leave for an employee
-        - cancel_leave: Cancel an existing leave request. 'start_date' is optional if the employee has only one active leave.
-        - list_requests: List leave requests. Admin: lists all (or filtered by employee_id). User: lists their own.
-        - get_all_employees: Get all employees with their status (admin only). Use this for "Who is on leave?", "Show all employees".
-        - get_availability_stats: Get availability statistics (admin only)
-        - check_availability_for_date: Check who is on leave for a specific date or date range.
-        
-        Date handling:
-        - Convert ALL dates to ISO 8601 format (YYYY-MM-DD)
-        - Handle date formats: "20/11", "20/11/2025", "Nov 20", "20-11-2025" → convert to "2025-11-20"
-        - Assume current year (2025) if year not specified
-        - Assume MM/DD format for slash dates (US format)
-        - "tomorrow" = today + 1 day
-        - "next Monday" = calculate next Monday's date
-        - "from tomorrow for 2 days" = tomorrow as start_date, tomorrow+1 as end_date
-        - "2 days from tomorrow" = tomorrow as start_date, tomorrow+1 as end_date
-        - "2 days starting tomorrow" = tomorrow as start_date, tomorrow+1 as end_date
-        - "3 days from 20/11 to 22/11" = start_date: "2025-11-20", end_date: "2025-11-22"
-        - If only days mentioned (e.g., "5 days"), use "days": 5, omit dates
-        - Always calculate actual dates when possible
-
-        Constraints & Rules:
-        - There are 30 engineers total; at least 20 must remain available.
-        - Dates must be ISO 8601 format (YYYY-MM-DD).
-        - Omit optional parameters when not provided.{admin_note}
-        - Extract employee_id from the message if present, otherwise use the one from context.
-        - Today's date is: {today} - use this for calculating relative dates like "tomorrow"
-        - Employee IDs are in format "firstname-lastname" (e.g., "adam-solomon").
-        - When user mentions just a first name (e.g., "Adam"), extract it as employee_id: "adam" (lowercase).
-        - The backend will resolve partial names to full employee IDs.
-        - "Who has leave requests?" -> list_requests
-        - "Who is on leave?" -> get_all_employees (or check_availability_for_date if date specified)
-        - "active leave requests" -> list_requests
-
-        Examples:
-        1. User: "cancel robert jones leave"
-           Output: {{{{ "action": "cancel_leave", "employee_id": "robert-jones", "parameters": {{{{}}}} }}}}
-        
-        2. User: "Who has leave requests?" (Admin)
-           Output: {{{{ "action": "list_requests", "employee_id": null, "parameters": {{{{}}}} }}}}
-
-        Output ONLY minified JSON, nothing else.
-        
-        User: {{message}}
-        """
+    return _COMMAND_TEMPLATE.format(
+        actions=actions,
+        admin_note=admin_note,
+        today=today,
+        message=user_message.strip(),
     )
-    return template.format(message=user_message.strip())
 
 
 def narrative_prompt(command: Dict, data_payload: Dict) -> str:
     """Build the instruction for turning raw data into a user-facing explanation."""
-    template = dedent(
-        """
-        You are summarizing the result of a leave-management operation.
-        User command:
-        {command}
-
-        Data:
-        {data}
-
-        Compose a short friendly paragraph describing the outcome for the engineer.
-        If listing requests, include specific dates, leave types, and statuses.
-        Mention remaining balance or denial reasons. Keep it under 100 words.
-        """
+    # Compact JSON is noticeably shorter than the Python repr, so it costs fewer input tokens
+    command = json.dumps(command, separators=(",", ":"), ensure_ascii=False, default=str)
+    data_payload = json.dumps(data_payload, separators=(",", ":"), ensure_ascii=False, default=str)
+    return (
+        "\nYou are summarizing the result of a leave-management operation.\n"
+        f"User command:\n{command}\n"
+        f"\nData:\n{data_payload}\n"
+        "\nCompose a short friendly paragraph describing the outcome for the engineer.\n"
+        "If listing requests, include specific dates, leave types, and statuses.\n"
+        "Mention remaining balance or denial reasons. Keep it under 100 words.\n"
     )
-    return template.format(command=command, data=data_payload)
-
-
@@ -8,7 +8,9 @@ be supported by loading them before importing this module.
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 
 try:
     from dotenv import load_dotenv
@@ -56,3 +58,47 @@ def load() -> AwsResources:
     )
 
 
+@lru_cache(maxsize=1)
+def get_boto_config():
+    """Return the shared botocore Config used for every boto3 client and resource."""
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": 5},
+    )
+
+
+# boto3 sessions are not thread-safe, so clients and resources are built
+# under a lock. Clients are safe to share between threads; resources (and the
+# Table/Bucket objects they create) are not, so each thread gets its own.
+_session_lock = threading.Lock()
+_thread_resources = threading.local()
+
+
+@lru_cache(maxsize=1)
+def get_session():
+    """Return the boto3 session shared by every client and resource."""
+    import boto3
+
+    return boto3.session.Session()
+
+
+@lru_cache(maxsize=None)
+def get_client(service_name: str, region: str | None = None):
+    """Return a cached boto3 client for the service, using the shared session and config."""
+    with _session_lock:
+        return get_session().client(service_name, region_name=region, config=get_boto_config())
+
+
+def get_resource(service_name: str, region: str | None = None):
+    """Return the calling thread's cached boto3 resource for the service, using the shared session and config."""
+    resources = getattr(_thread_resources, "cache", None)
+    if resources is None:
+        resources = _thread_resources.cache = {}
+    key = (service_name, region)
+    if key not in resources:
+        with _session_lock:
+            resources[key] = get_session().resource(service_name, region_name=region, config=get_boto_config())
+    return resources[key]
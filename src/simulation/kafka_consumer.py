@@ -15,9 +15,14 @@ import json
 import os
 from typing import Any, Dict
 
-import boto3
 from kafka import KafkaConsumer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional; records fall back to the stdlib codec
+
+from src.config import get_client
 from src.storage.s3_storage import S3Storage
 
 ENGINEER_TARGET = 20  # At least 20 must remain available
@@ -25,10 +30,19 @@ TOTAL_ENGINEERS = 30  # Total engineers in the system
 
 
 def parse_message(message: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(message)
     decoded = message.decode("utf-8")
     return json.loads(decoded)
 
 
+def _encode(record: Dict[str, Any]) -> bytes:
+    """Serialize a record to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record).encode("utf-8")
+
+
 def update_request_tables(
     storage: S3Storage,
     record: Dict[str, Any],
@@ -53,17 +67,19 @@ def update_request_tables(
     if record["event_type"] != "request_approved":
         return "PENDING"
 
+    # Compute remaining availability BEFORE approving this request
+    # Count all engineers currently on leave (excluding this employee if they're switching status).
+    # The same pass picks out this employee's item, so it needs no separate read.
+    engineer_item = None
+    unavailable = 0
+    for item in storage.scan("EngineerAvailability"):
+        if item.get("employee_id") == employee_id:
+            engineer_item = item
+        elif item.get("current_status") == "ON_LEAVE":
+            unavailable += 1
+
     # Check if employee is already on leave (to avoid double-counting)
-    engineer_item = storage.get_item("EngineerAvailability", {"employee_id": employee_id})
     current_status = engineer_item.get("current_status", "AVAILABLE") if engineer_item else "AVAILABLE"
-
-    # Compute remaining availability BEFORE approving this request
-    # Count all engineers currently on leave (excluding this employee if they're switching status)
-    availability = storage.scan("EngineerAvailability")
-    unavailable = sum(
-        1 for item in availability 
-        if item.get("current_status") == "ON_LEAVE" and item.get("employee_id") != employee_id
-    )
     # Add 1 if this employee will be going on leave
     if current_status != "ON_LEAVE":
         unavailable += 1
@@ -114,7 +130,7 @@ def forward_to_kinesis(kinesis_client, stream_name: str, record: Dict[str, Any])
     kinesis_client.put_record(
         StreamName=stream_name,
         PartitionKey=record["employee_id"],
-        Data=json.dumps(record).encode("utf-8"),
+        Data=_encode(record),
     )
 
 
@@ -123,7 +139,7 @@ def maybe_firehose(firehose_client, delivery_stream: str, record: Dict[str, Any]
         return
     firehose_client.put_record(
         DeliveryStreamName=delivery_stream,
-        Record={"Data": json.dumps(record).encode("utf-8")},
+        Record={"Data": _encode(record)},
     )
 
 
@@ -149,8 +165,9 @@ def main(group_id: str) -> None:
         group_id=group_id,
         value_deserializer=lambda value: value,
     )
-    kinesis = boto3.client("kinesis", region_name=region)
-    firehose = boto3.client("firehose", region_name=region)
+    # Shared session and keep-alive pool, same as the storage adapter's clients
+    kinesis = get_client("kinesis", region)
+    firehose = get_client("firehose", region)
 
     for message in consumer:
         record = parse_message(message.value)
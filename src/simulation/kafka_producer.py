@@ -17,10 +17,18 @@ from typing import Iterable
 import pandas as pd
 from kafka import KafkaProducer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional; records fall back to the stdlib encoder
+
 from src.config import load as load_config
 
 
 def _serialize(record: dict) -> bytes:
+    if orjson is not None:
+        # orjson output is already compact UTF-8 bytes
+        return orjson.dumps(record)
     return json.dumps(record, separators=(",", ":")).encode("utf-8")
 
 
@@ -4,26 +4,109 @@ DynamoDB storage implementation for leave management system.
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from decimal import Decimal
 
-import boto3
 from botocore.exceptions import ClientError
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.conditions import ConditionBase, Key, Attr
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+try:
+    from amazondax import AmazonDaxClient
+except ImportError:
+    AmazonDaxClient = None  # amazon-dax-client is optional; only needed with a DAX cluster
+
+# Try relative imports first (for local dev), then absolute imports (for Lambda)
+try:
+    from ..config import get_resource
+except ImportError:
+    from config import get_resource
+
+# EngineerAvailability items carry a constant entity_type so the whole roster
+# can be read with a Query on this GSI instead of a full-table Scan
+EMPLOYEE_INDEX = "entity_type-index"
+EMPLOYEE_ENTITY_TYPE = "EMPLOYEE"
+
+# LeaveRequests GSI keyed by status and start_date, so the leave overlapping
+# a date range is a Query on the APPROVED partition instead of a Scan
+APPROVED_BY_START_INDEX = "status-start_date-index"
+
+# Key of the EngineerAvailability item holding the roster size and on-leave
+# counter; it is bookkeeping, not an employee, so scans leave it out
+AVAILABILITY_STATS_KEY = "__stats__"
+
+# Parallel-scan segments used when reading a whole table
+SCAN_SEGMENTS = 4
+
+# BatchGetItem accepts at most this many keys per call
+BATCH_GET_LIMIT = 100
+
+# Retries (with exponential backoff) for keys DynamoDB leaves unprocessed
+BATCH_GET_RETRIES = 5
+
+_DESERIALIZER = TypeDeserializer()
+_SERIALIZER = TypeSerializer()
+
+# Request fields of a TransactWriteItems operation holding attribute values
+_TRANSACT_VALUE_FIELDS = ('Item', 'Key', 'ExpressionAttributeValues')
+
+
+def _dax_endpoint(endpoint: Optional[str]) -> Optional[str]:
+    """Return the DAX cluster endpoint, or None if DAX isn't configured or can't be used."""
+    if endpoint and AmazonDaxClient is None:
+        print("Warning: LEAVE_MGMT_DAX_ENDPOINT is set but amazon-dax-client is not installed; using DynamoDB directly")
+        return None
+    return endpoint or None
+
 
 class DynamoDBStorage:
-    """DynamoDB storage adapter."""
+    """DynamoDB storage adapter.
+
+    When a DAX endpoint is configured (``dax_endpoint`` or the
+    LEAVE_MGMT_DAX_ENDPOINT environment variable), item reads and writes go
+    through the DAX cluster; writes must too, so that its item cache stays
+    write-through. Whole-table scans and counts always go to DynamoDB.
+
+    boto3 resources are not thread-safe, so each thread reading or writing
+    items gets its own resource and Table objects.
+    """
     
-    def __init__(self, region: str = "us-east-1"):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
-        self.tables = {}
+    def __init__(self, region: str = "us-east-1", dax_endpoint: Optional[str] = None):
+        self.region = region
+        # Only used for its low-level client, which can be shared between threads
+        self.dynamodb = get_resource('dynamodb', region)
+        self.dax_endpoint = _dax_endpoint(dax_endpoint or os.getenv("LEAVE_MGMT_DAX_ENDPOINT"))
+        self._local = threading.local()
+
+    @property
+    def item_resource(self):
+        """This thread's resource for item reads and writes (DAX if configured)."""
+        resource = getattr(self._local, 'item_resource', None)
+        if resource is None:
+            if self.dax_endpoint:
+                resource = AmazonDaxClient.resource(endpoint_url=self.dax_endpoint, region_name=self.region)
+            else:
+                resource = get_resource('dynamodb', self.region)
+            self._local.item_resource = resource
+            self._local.tables = {}
+        return resource
         
     def _get_table(self, table_name: str):
-        """Get or create table resource cache."""
-        if table_name not in self.tables:
-            self.tables[table_name] = self.dynamodb.Table(table_name)
-        return self.tables[table_name]
+        """Get or create this thread's cached table resource."""
+        resource = self.item_resource
+        tables = self._local.tables
+        if table_name not in tables:
+            tables[table_name] = resource.Table(table_name)
+        return tables[table_name]
     
+    def preload_tables(self, table_names: List[str]) -> None:
+        """Build this thread's table resources ahead of the first request that needs them."""
+        for table_name in table_names:
+            self._get_table(table_name)
+
     def put_item(self, table: str, item: Dict[str, Any]) -> None:
         """Store an item in DynamoDB."""
         # DynamoDB handles Decimal conversion automatically if using boto3 resource
@@ -39,16 +122,50 @@ class DynamoDBStorage:
             print(f"Error getting item: {e}")
             return None
             
+    def batch_get_item(self, table: str, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Retrieve several items by key, BATCH_GET_LIMIT keys per round trip.
+
+        Missing items are simply absent from the result, which is unordered.
+        """
+        items = []
+        for start in range(0, len(keys), BATCH_GET_LIMIT):
+            request = {table: {'Keys': keys[start:start + BATCH_GET_LIMIT]}}
+            for attempt in range(BATCH_GET_RETRIES + 1):
+                response = self.item_resource.batch_get_item(RequestItems=request)
+                items.extend(response.get('Responses', {}).get(table, []))
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+                if attempt < BATCH_GET_RETRIES:
+                    # Unprocessed keys mean the table is throttling; back off
+                    time.sleep(0.05 * 2 ** attempt)
+            else:
+                print(f"Warning: {len(request[table]['Keys'])} keys left unprocessed in {table}")
+        return self._decimal_to_float(items)
+
     def query(self, table: str, index_name: Optional[str] = None,
-              key_condition: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Query items."""
+              key_condition: Optional[Dict[str, Any]] = None,
+              filter_condition: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Query items.
+
+        ``filter_condition`` holds attribute equalities applied server-side to
+        the items the key condition selects, so non-matching items are never
+        returned. Either condition may instead be a boto3 condition (e.g.
+        ``Key("start_date").lte(...)``) for comparisons other than equality.
+        """
         # This is a simplified query wrapper. 
         # In a real app, you'd construct KeyConditionExpression properly.
         # For now, assuming simple key matching or scan if no key provided (which is bad but matches S3 implementation behavior for compatibility)
         
         # If no key condition, we must scan (or query all partition key if known, but here generic)
         if not key_condition:
-            return self.scan(table)
+            items = self.scan(table)
+            if filter_condition:
+                items = [
+                    item for item in items
+                    if all(item.get(k) == v for k, v in filter_condition.items())
+                ]
+            return items
 
         # Construct KeyConditionExpression
         # This is tricky without knowing the schema structure generic wrapper
@@ -61,10 +178,13 @@ class DynamoDBStorage:
         if index_name:
             kwargs['IndexName'] = index_name
             
-        # Simple equality conditions for now
+        # Simple equality conditions unless a prebuilt condition is given
         conditions = []
-        for k, v in key_condition.items():
-            conditions.append(Key(k).eq(v))
+        if isinstance(key_condition, ConditionBase):
+            conditions.append(key_condition)
+        else:
+            for k, v in key_condition.items():
+                conditions.append(Key(k).eq(v))
             
         if conditions:
             # Combine conditions (though usually only one for PK/GSI PK)
@@ -72,27 +192,101 @@ class DynamoDBStorage:
             for c in conditions[1:]:
                 condition = condition & c
             kwargs['KeyConditionExpression'] = condition
+
+        if isinstance(filter_condition, ConditionBase):
+            kwargs['FilterExpression'] = filter_condition
+        elif filter_condition:
+            filters = [Attr(k).eq(v) for k, v in filter_condition.items()]
+            condition = filters[0]
+            for f in filters[1:]:
+                condition = condition & f
+            kwargs['FilterExpression'] = condition
             
         response = self._get_table(table).query(**kwargs)
-        return self._decimal_to_float(response.get('Items', []))
-    
-    def scan(self, table: str) -> List[Dict[str, Any]]:
-        """Scan all items in a table."""
-        response = self._get_table(table).scan()
         items = response.get('Items', [])
         
         # Handle pagination
         while 'LastEvaluatedKey' in response:
-            response = self._get_table(table).scan(ExclusiveStartKey=response['LastEvaluatedKey'])
+            response = self._get_table(table).query(ExclusiveStartKey=response['LastEvaluatedKey'], **kwargs)
             items.extend(response.get('Items', []))
             
         return self._decimal_to_float(items)
     
+    def _scan_segment(self, table: str, segment: int, total_segments: int,
+                      projection: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Read every page of one parallel-scan segment."""
+        kwargs = {}
+        if projection:
+            # Placeholders keep reserved words such as "name" usable in the expression
+            placeholders = {f"#a{i}": name for i, name in enumerate(projection)}
+            kwargs['ProjectionExpression'] = ", ".join(placeholders)
+            kwargs['ExpressionAttributeNames'] = placeholders
+        # The low-level client is thread-safe (Table resources are not), but it
+        # returns typed attribute values that must be deserialized.
+        paginator = self.dynamodb.meta.client.get_paginator('scan')
+        pages = paginator.paginate(
+            TableName=table, Segment=segment, TotalSegments=total_segments, **kwargs
+        )
+        return [
+            {k: _DESERIALIZER.deserialize(v) for k, v in item.items()}
+            for page in pages
+            for item in page.get('Items', [])
+        ]
+
+    def scan(self, table: str, projection: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Scan all items in a table, reading SCAN_SEGMENTS segments concurrently.
+
+        If ``projection`` lists attribute names, only those attributes are read.
+        """
+        with ThreadPoolExecutor(max_workers=SCAN_SEGMENTS) as executor:
+            segments = executor.map(
+                lambda segment: self._scan_segment(table, segment, SCAN_SEGMENTS, projection),
+                range(SCAN_SEGMENTS),
+            )
+            items = [
+                item
+                for segment in segments
+                for item in segment
+                if item.get('employee_id') != AVAILABILITY_STATS_KEY
+            ]
+            
+        return self._decimal_to_float(items)
+    
+    def count(self, table: str, attribute: str, value: str,
+              stop_at_unmatched: Optional[int] = None) -> Tuple[int, int]:
+        """Count a table's items whose ``attribute`` equals ``value``.
+
+        Returns ``(matching, total)``. Scanning with Select=COUNT returns only
+        the counts, so no items are transferred or deserialized. If
+        ``stop_at_unmatched`` is given, the scan stops once that many
+        non-matching items have been seen, and both counts are partial.
+        """
+        paginator = self.dynamodb.meta.client.get_paginator('scan')
+        pages = paginator.paginate(
+            TableName=table,
+            Select='COUNT',
+            FilterExpression='#attr = :value',
+            ExpressionAttributeNames={'#attr': attribute},
+            ExpressionAttributeValues={':value': _SERIALIZER.serialize(value)},
+        )
+        matching = total = 0
+        for page in pages:
+            matching += page['Count']
+            total += page['ScannedCount']
+            if stop_at_unmatched is not None and total - matching >= stop_at_unmatched:
+                break
+        return matching, total
+
     def update_item(self, table: str, key: Dict[str, str],
                    update_expression: str,
                    expression_values: Dict[str, Any],
-                   expression_names: Optional[Dict[str, str]] = None) -> None:
-        """Update an item."""
+                   expression_names: Optional[Dict[str, str]] = None,
+                   condition: Optional[str] = None) -> None:
+        """Update an item.
+
+        If ``condition`` (a ConditionExpression) does not hold, nothing is
+        written and ClientError (ConditionalCheckFailedException) is raised.
+        """
         kwargs = {
             'Key': key,
             'UpdateExpression': update_expression,
@@ -100,6 +294,8 @@ class DynamoDBStorage:
         }
         if expression_names:
             kwargs['ExpressionAttributeNames'] = expression_names
+        if condition:
+            kwargs['ConditionExpression'] = condition
             
         self._get_table(table).update_item(**kwargs)
         
@@ -120,6 +316,28 @@ class DynamoDBStorage:
                     elif 'DeleteRequest' in item_dict:
                         batch.delete_item(Key=item_dict['DeleteRequest']['Key'])
 
+    def transact_write_items(self, operations: List[Dict[str, Any]]) -> None:
+        """Apply several writes atomically in one TransactWriteItems call.
+
+        Operations use the TransactWriteItems shape ({'Put': {...}},
+        {'Update': {...}}, ...) with plain Python values; if any condition
+        fails, nothing is written and ClientError
+        (TransactionCanceledException) is raised.
+        """
+        # The low-level client only accepts typed attribute values
+        transact_items = []
+        for operation in operations:
+            for kind, request in operation.items():
+                request = dict(request)
+                for field in _TRANSACT_VALUE_FIELDS:
+                    if field in request:
+                        request[field] = {
+                            k: _SERIALIZER.serialize(v)
+                            for k, v in self._float_to_decimal(request[field]).items()
+                        }
+                transact_items.append({kind: request})
+        self.item_resource.meta.client.transact_write_items(TransactItems=transact_items)
+
     def _float_to_decimal(self, obj: Any) -> Any:
         """Recursively convert float to Decimal for DynamoDB."""
         if isinstance(obj, list):
@@ -140,7 +358,7 @@ class DynamoDBStorage:
             return float(obj)
         return obj
 
-def create_storage(region: str = "us-east-1") -> DynamoDBStorage:
+def create_storage(region: str = "us-east-1", dax_endpoint: Optional[str] = None) -> DynamoDBStorage:
     """Factory function to create storage instance."""
-    return DynamoDBStorage(region=region)
+    return DynamoDBStorage(region=region, dax_endpoint=dax_endpoint)
 
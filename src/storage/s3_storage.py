@@ -6,12 +6,25 @@ from __future__ import annotations
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 from decimal import Decimal
 
-import boto3
 from botocore.exceptions import ClientError
 
+# Try relative imports first (for local dev), then absolute imports (for Lambda)
+try:
+    from ..config import get_client
+except ImportError:
+    from config import get_client
+
+
+# Concurrent GetObject calls used when reading a whole table prefix
+READ_WORKERS = 8
+
+# Concurrent PutObject calls used by batch_write_item
+WRITE_WORKERS = 8
+
 
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal types."""
@@ -26,9 +39,9 @@ class S3Storage:
     
     def __init__(self, bucket_name: str, region: str = "us-east-1"):
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client('s3', region_name=region)
-        self.s3_resource = boto3.resource('s3', region_name=region)
-        self.bucket = self.s3_resource.Bucket(bucket_name)
+        # Only the low-level client is used: it is thread-safe, while resource
+        # objects (e.g. a Bucket) are not and the reads below run in threads
+        self.s3_client = get_client('s3', region)
         
     def _get_key(self, table: str, item_id: str) -> str:
         """Generate S3 key for an item."""
@@ -36,11 +49,10 @@ class S3Storage:
     
     def _list_keys_prefix(self, prefix: str) -> List[str]:
         """List all keys with given prefix."""
-        try:
-            objects = self.bucket.objects.filter(Prefix=prefix)
-            return [obj.key for obj in objects]
-        except ClientError:
-            return []
+        pages = self.s3_client.get_paginator('list_objects_v2').paginate(
+            Bucket=self.bucket_name, Prefix=prefix
+        )
+        return [obj['Key'] for page in pages for obj in page.get('Contents', [])]
     
     def put_item(self, table: str, item: Dict[str, Any]) -> None:
         """Store an item in S3."""
@@ -92,40 +104,67 @@ class S3Storage:
                 return None
             raise
     
+    def batch_get_item(self, table: str, keys: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Retrieve several items by key concurrently; missing items are omitted."""
+        if not keys:
+            return []
+        with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(keys))) as executor:
+            items = executor.map(lambda key: self.get_item(table, key), keys)
+            return [item for item in items if item is not None]
+    
+    def _read_object(self, key: str) -> Optional[Dict[str, Any]]:
+        """Download and decode a single JSON item, or None if it no longer exists."""
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=key
+            )
+        except ClientError as e:
+            # Deleted between listing and reading
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                return None
+            raise
+        return json.loads(response['Body'].read().decode('utf-8'))
+    
     def query(self, table: str, index_name: Optional[str] = None,
-              key_condition: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+              key_condition: Optional[Dict[str, Any]] = None,
+              filter_condition: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Query items (simulated by listing and filtering)."""
         prefix = f"{table}/"
+        # Keys and filters are both plain equality checks here
+        if filter_condition:
+            key_condition = {**(key_condition or {}), **filter_condition}
         
-        # List all objects with this prefix
+        # List all objects with this prefix, then fetch them concurrently since
+        # every item is a separate GetObject round-trip
         results = []
-        try:
-            for obj in self.bucket.objects.filter(Prefix=prefix):
-                response = self.s3_client.get_object(
-                    Bucket=self.bucket_name,
-                    Key=obj.key
-                )
-                item = json.loads(response['Body'].read().decode('utf-8'))
-                
-                # Apply filter if provided
-                if key_condition:
-                    match = True
-                    for key, value in key_condition.items():
-                        if item.get(key) != value:
-                            match = False
-                            break
-                    if match:
-                        results.append(item)
-                else:
+        keys = self._list_keys_prefix(prefix)
+        if not keys:
+            return results
+        with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(keys))) as executor:
+            items = [item for item in executor.map(self._read_object, keys) if item is not None]
+        
+        for item in items:
+            # Apply filter if provided
+            if key_condition:
+                match = True
+                for key, value in key_condition.items():
+                    if item.get(key) != value:
+                        match = False
+                        break
+                if match:
                     results.append(item)
-        except ClientError:
-            pass
+            else:
+                results.append(item)
         
         return results
     
-    def scan(self, table: str) -> List[Dict[str, Any]]:
-        """Scan all items in a table."""
-        return self.query(table)
+    def scan(self, table: str, projection: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Scan all items in a table, keeping only the ``projection`` attributes if given."""
+        items = self.query(table)
+        if projection:
+            items = [{k: item[k] for k in projection if k in item} for item in items]
+        return items
     
     def update_item(self, table: str, key: Dict[str, str],
                    update_expression: str,
@@ -194,15 +233,24 @@ class S3Storage:
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
-        except ClientError:
-            pass  # Object doesn't exist, that's fine
+        except ClientError as e:
+            # Object doesn't exist, that's fine; anything else is a real failure
+            if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                raise
     
     def batch_write_item(self, request_items: Dict[str, List[Dict[str, Any]]]) -> None:
-        """Batch write items (simplified)."""
-        for table, items in request_items.items():
-            for item_dict in items:
-                if 'PutRequest' in item_dict:
-                    self.put_item(table, item_dict['PutRequest']['Item'])
+        """Batch write items, uploading the objects concurrently."""
+        puts = [
+            (table, item_dict['PutRequest']['Item'])
+            for table, items in request_items.items()
+            for item_dict in items
+            if 'PutRequest' in item_dict
+        ]
+        if not puts:
+            return
+        with ThreadPoolExecutor(max_workers=min(WRITE_WORKERS, len(puts))) as executor:
+            # list() drains the iterator so the first failed upload is raised
+            list(executor.map(lambda put: self.put_item(*put), puts))
 
 
 def create_storage(bucket_name: str, region: str = "us-east-1") -> S3Storage: